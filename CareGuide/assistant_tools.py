@@ -49,10 +49,14 @@ dict[str,str]) and avoid complex typing unions.
 
 from __future__ import annotations
 
-import os, re, time, uuid, csv, json, math
-from typing import Optional, Dict, Any, List, Tuple
-from datetime import datetime
-from urllib.parse import urlparse
+import functools
+import os, re, time, csv, json, math, random, threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Optional, Dict, Any, List, Mapping, Tuple
+from datetime import datetime, timezone
 
 # ------------------------
 # Optional project modules
@@ -73,6 +77,9 @@ except Exception:
             if clear:
                 self._buf.clear()
             return items
+        def clear(self) -> None:
+            """Drop all buffered evidence items."""
+            self._buf.clear()
     EVIDENCE = _Ev()
 
 # RAG dataset hooks (safe fallback if missing)
@@ -111,6 +118,9 @@ except Exception:
 # ------------------------
 GOOGLE_MAPS_API_KEY = os.getenv("GOOGLE_MAPS_API_KEY", _CONF_MAPS_KEY or "")
 HTTP_TIMEOUT_SECS = int(os.getenv("HTTP_TIMEOUT_SECS", str(_CONF_TIMEOUT or 10)))
+# Split (connect, read) timeout: a dead network should fail in ~3s instead of
+# holding the tool call for the full read budget.
+_HTTP_TIMEOUT = (3.05, HTTP_TIMEOUT_SECS)
 PHI_ZERO_RETENTION = str(os.getenv("PHI_ZERO_RETENTION", _CONF_ZERO_RET or "")).lower() in ("1", "true", "yes")
 # Evidence sources allowed to render in panel (others are hidden)
 EVIDENCE_ALLOWED_SOURCES = set(
@@ -119,51 +129,114 @@ EVIDENCE_ALLOWED_SOURCES = set(
 
 MAPS_KEY = GOOGLE_MAPS_API_KEY
 
+# Display-only ID generator: appointment/timeline IDs are not security
+# sensitive, so a preseeded PRNG beats uuid4's per-call os.urandom syscall.
+_RNG = random.Random()
+
+def _short_id(prefix: str) -> str:
+    """Display ID like "APT-1A2B3C4D": exactly 32 random bits, one format."""
+    return f"{prefix}-{_RNG.getrandbits(32):08X}"
+
 # ------------------------
 # Small helpers / caching
 # ------------------------
 class TTLCache:
-    """Very small TTL-based in-process cache.
+    """Very small TTL-based in-process LRU cache.
 
-    Stores up to `max_items` (key -> (timestamp, value)).
-    Evicts oldest items when capacity is exceeded. Entries older than `ttl_sec`
-    are treated as expired on read.
+    Stores up to `max_items` (key -> (timestamp, value)) in an OrderedDict
+    kept in recency order: reads move entries to the end, inserts drop the
+    least-recently-used entry once capacity is exceeded. Entries older than
+    `ttl_sec` are treated as expired on read.
 
-    Note: intentionally simple; no thread-safety guarantees.
+    Thread-safe: ADK/FastAPI may run tool calls on worker threads, so all
+    store mutations happen under a single RLock.
     """
 
     def __init__(self, ttl_sec: int = 600, max_items: int = 256):
         self.ttl = ttl_sec
         self.max_items = max_items
-        self.store: Dict[str, Tuple[float, Any]] = {}
+        self.store: OrderedDict[Any, Tuple[float, Any]] = OrderedDict()
+        self._lock = threading.RLock()
 
-    def get(self, k: str) -> Any | None:
+    def get(self, k: Any) -> Any | None:
         """Return cached value if present and not expired; otherwise None."""
-        self._evict()
-        x = self.store.get(k)
-        if not x:
-            return None
-        ts, v = x
-        if time.time() - ts > self.ttl:
-            self.store.pop(k, None)
-            return None
-        return v
-
-    def set(self, k: str, v: Any) -> None:
-        """Insert/update cache entry and evict if over capacity."""
-        self._evict()
-        self.store[k] = (time.time(), v)
-
-    def _evict(self) -> None:
-        """Trim cache to `max_items` and lazily drop oldest entries."""
-        if len(self.store) <= self.max_items:
-            return
-        for k in sorted(self.store.keys(), key=lambda x: self.store[x][0])[: len(self.store) - self.max_items]:
+        with self._lock:
+            x = self.store.get(k)
+            if not x:
+                return None
+            exp, v = x
+            if time.time() > exp:
+                self.store.pop(k, None)
+                return None
+            self.store.move_to_end(k)
+            return v
+
+    def set(self, k: Any, v: Any, ttl: float | None = None) -> None:
+        """Insert/update cache entry (as most recent) and evict LRU overflow.
+
+        `ttl` overrides the cache-wide default for this entry — used for
+        short-lived negative entries (errors, empty results).
+        """
+        with self._lock:
             self.store.pop(k, None)
+            self.store[k] = (time.time() + (ttl if ttl is not None else self.ttl), v)
+            while len(self.store) > self.max_items:
+                self.store.popitem(last=False)
 
 # Short-lived caches for HTTP and Places results
 _HTTP_CACHE = TTLCache(ttl_sec=600)
 _PLACES_CACHE = TTLCache(ttl_sec=600)
+# Negative TTL: errors and empty results are remembered briefly so a user
+# retrying the same bad input doesn't re-hit Google, but real answers can
+# still appear once the upstream recovers.
+_NEG_TTL_SEC = 60
+
+# Optional fast JSON decoder: orjson parses the few-KB Maps payloads ~2-3x
+# faster than stdlib json. Falls back silently when not installed.
+try:
+    import orjson as _orjson
+except Exception:
+    _orjson = None
+
+def _decode_json(r: Any) -> Dict[str, Any]:
+    """Decode a requests.Response body to a dict, preferring orjson."""
+    if _orjson is not None:
+        return _orjson.loads(r.content)
+    return r.json()
+
+# Optional persistent cache for near-static Maps data (survives restarts).
+try:
+    from .assistant_tools_cache import SQLiteCache
+    _DISK_CACHE: Optional[SQLiteCache] = SQLiteCache()
+except Exception:
+    _DISK_CACHE = None
+
+# Disk TTLs: geocodes and place details are effectively static.
+_GEOCODE_DISK_TTL = 24 * 3600
+_DETAILS_DISK_TTL = 7 * 24 * 3600
+
+# Lazily-built shared HTTP session: connection pooling (keep-alive) avoids a
+# fresh TCP+TLS handshake per Maps call, and the retry policy absorbs the
+# occasional 5xx/429 from the Google endpoints.
+_HTTP_SESSION = None
+_HTTP_SESSION_LOCK = threading.Lock()
+
+def _get_http_session():
+    """Return the process-wide pooled requests.Session (built on first use)."""
+    global _HTTP_SESSION
+    if _HTTP_SESSION is None:
+        with _HTTP_SESSION_LOCK:
+            if _HTTP_SESSION is None:
+                import requests  # local import to avoid hard dep if not needed
+                from requests.adapters import HTTPAdapter, Retry
+                s = requests.Session()
+                retry = Retry(total=2, backoff_factor=0.2,
+                              status_forcelist=(429, 500, 502, 503, 504))
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry)
+                s.mount("https://", adapter)
+                s.mount("http://", adapter)
+                _HTTP_SESSION = s
+    return _HTTP_SESSION
 
 def _http_get(url: str, params: Dict[str, Any]) -> Dict[str, Any]:
     """GET helper with simple memoization and error shielding.
@@ -175,39 +248,68 @@ def _http_get(url: str, params: Dict[str, Any]) -> Dict[str, Any]:
     Returns:
         Parsed JSON dict on success, or {"_error": "..."} on failure.
     """
-    key = f"GET|{url}|{sorted(params.items())}"
+    # frozenset is order-insensitive like the old sorted() key but skips the
+    # sort + string formatting on every lookup (params values are hashable).
+    key = (url, frozenset(params.items()))
     cached = _HTTP_CACHE.get(key)
     if cached is not None:
         return cached
     try:
-        import requests  # local import to avoid hard dep if not needed
-        r = requests.get(url, params=params, timeout=HTTP_TIMEOUT_SECS)
+        r = _get_http_session().get(url, params=params, timeout=_HTTP_TIMEOUT)
         r.raise_for_status()
-        data = r.json()
-        _HTTP_CACHE.set(key, data)
+        data = _decode_json(r)
+        if data.get("status") in (None, "OK"):
+            _HTTP_CACHE.set(key, data)
+        else:
+            # ZERO_RESULTS / OVER_QUERY_LIMIT / etc.: negative-cache briefly.
+            _HTTP_CACHE.set(key, data, ttl=_NEG_TTL_SEC)
         return data
     except Exception as e:
-        return {"_error": str(e)}
+        err = {"_error": str(e)}
+        _HTTP_CACHE.set(key, err, ttl=_NEG_TTL_SEC)
+        return err
+
+# Compiled once at import so hot-path helpers skip the re-module cache lookup.
+_WS_RE = re.compile(r"\s+")
+_WHATIF_FEVER_RE = re.compile(r"\b39(\.|,)?\s?c|102(\.|,)?\s?f|high fever\b")
+_WHATIF_EMERGENCY_RE = re.compile(r"\bchest pain|severe trouble breathing|shortness of breath\b")
+
+# Hoisted keyword/action constants so the per-message tool calls don't
+# rebuild the same literals on every invocation.
+# One alternation pass over the suspected text instead of five substring scans.
+_SX_RE = re.compile(r"\b(flu|strep|sore throat|severe|chest pain)\b")
+# Shape precheck for booking datetimes: rejecting garbage with a match beats
+# raising/catching ValueError out of fromisoformat on the common misuse path.
+_ISO_RE = re.compile(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}(:\d{2})?$")
+_WHATIF_DEFAULT_ACTIONS = ("Monitor symptoms", "Hydrate and rest", "Seek care if symptoms worsen")
+_WHATIF_EMERGENCY_ACTIONS = ("Seek emergency care now", "Avoid exertion", "Do not delay")
 
 def _norm(s: str) -> str:
     """Normalize free text for matching (lowercase, collapse whitespace)."""
-    return re.sub(r"\s+", " ", (s or "").strip().lower())
+    return _WS_RE.sub(" ", (s or "").strip().lower())
 
 def _domain(url: Optional[str]) -> Optional[str]:
     """Extract domain (without www.) from a URL string; return None on failure."""
     if not url:
         return None
-    try:
-        d = urlparse(url).netloc
-        return d.replace("www.", "")
-    except Exception:
-        return url
+    # Cheap host extraction: Places website URLs are already canonical, so a
+    # full urlparse (RFC 3986 state machine) is overkill here.
+    i = url.find("://")
+    host = url[i + 3:] if i >= 0 else url
+    host = host.split("/", 1)[0]
+    return host.removeprefix("www.")
+
+# Deletion table for everything but digits and '+': str.translate beats the
+# regex engine by a wide margin on short phone strings.
+_TEL_TABLE = str.maketrans("", "", "".join(
+    chr(c) for c in range(256) if not (chr(c).isdigit() or chr(c) == "+")
+))
 
 def _tel_url(phone: Optional[str]) -> Optional[str]:
     """Create a tel: URL for a human-formatted phone number (or None)."""
     if not phone:
         return None
-    num = re.sub(r"[^\d+]", "", phone)
+    num = phone.translate(_TEL_TABLE)
     return f"tel:{num}" if num else None
 
 # ------------------------
@@ -226,51 +328,81 @@ def evidence_snapshot(clear: bool = True) -> dict:
     filtered = [i for i in items if (i.get("source") in EVIDENCE_ALLOWED_SOURCES)]
     out = {"items": filtered}
     if clear and filtered:
-        EVIDENCE.snapshot(clear=True)
+        # Plain clear: the second snapshot() here used to rebuild (and throw
+        # away) the whole dict list just to empty the buffer.
+        EVIDENCE.clear()
     return out
 
 # ------------------------
 # Greeting (no startup location prompt)
 # ------------------------
-def greeting() -> dict:
-    """Render the initial numbered main menu.
+# Static menu lines; only the kb_line between prefix and suffix changes per call.
+_GREET_PREFIX = (
+    "**Hi, I’m CareGuide — your safety-first medical assistant.**",
+)
+_GREET_SUFFIX = (
+    "**What I can do (reply with a number):**",
+    "1) Triage my symptoms (not a diagnosis)",
+    "2) Find nearby care (share your city/area)",
+    "3) Estimate typical costs",
+    "4) What-If safety check",
+    "5) Medication side-effect check",
+    "6) Book an appointment",
+    "7) Fill intake form",
+    "0) Main menu",
+    # Keep both lines if your UX requires; the agent prompt ensures only one line
+    # is printed at the very bottom of each assistant message.
+    "\nThis is general guidance, not a medical diagnosis.\n",
+    "Disclaimer: This is general guidance, not a medical diagnosis.",
+)
 
-    Notes:
-        - Per product decision, we do **not** ask for location here.
-        - We still log a greeting evidence breadcrumb for internal debugging.
+# Menu joined once at import; only the kb stats line is interpolated per call.
+_GREET_TEMPLATE = "\n".join(_GREET_PREFIX + ("{}",) + _GREET_SUFFIX)
+
+# Warm the dataset stats in the background at import: on a cold start the
+# first rag_stats() call can build the whole index, and the greeting should
+# never make the user wait for a nice-to-have stats line.
+_STATS_EX = ThreadPoolExecutor(max_workers=1)
+_STATS_FUT = _STATS_EX.submit(rag_stats)
+_STATS_EX.shutdown(wait=False)
+
+@functools.lru_cache(maxsize=1)
+def _greeting_text(slot: int) -> str:
+    """Fully rendered greeting, refreshed per 30s timeslot.
+
+    Waits at most 50ms for the background stats warm-up; if the index is
+    still building, the generic line ships now and the next slot retries.
     """
     try:
-        stats = rag_stats()
+        stats = _STATS_FUT.result(timeout=0.05)
         kb_line = f"Scanning ~{stats.get('rows', 0):,} similar cases from our library."
     except Exception:
         kb_line = "Scanning similar cases from our medical library."
+    return _GREET_TEMPLATE.format(kb_line)
 
-    lines: List[str] = []
-    lines.append("**Hi, I’m CareGuide — your safety-first medical assistant.**")
-    lines.append(kb_line)
-    lines.append("**What I can do (reply with a number):**")
-    lines.append("1) Triage my symptoms (not a diagnosis)")
-    lines.append("2) Find nearby care (share your city/area)")
-    lines.append("3) Estimate typical costs")
-    lines.append("4) What-If safety check")
-    lines.append("5) Medication side-effect check")
-    lines.append("6) Book an appointment")
-    lines.append("7) Fill intake form")
-    lines.append("0) Main menu")
-    # Keep both lines if your UX requires; the agent prompt ensures only one line
-    # is printed at the very bottom of each assistant message.
-    lines.append("\nThis is general guidance, not a medical diagnosis.\n")
-    lines.append("Disclaimer: This is general guidance, not a medical diagnosis.")
+def greeting() -> dict:
+    """Render the initial numbered main menu.
 
+    Notes:
+        - Per product decision, we do **not** ask for location here.
+        - We still log a greeting evidence breadcrumb for internal debugging.
+    """
     EVIDENCE.add("greeting", "menu v4 (numbered, no startup location prompt)")
-    return {"text": "\n".join(lines)}
+    return {"text": _greeting_text(int(time.time() // 30))}
 
 # ------------------------
 # Location memory (in-session only)
 # ------------------------
-_LAST_LOCATION: Dict[str, Any] = {
-    "input": "", "formatted": "", "lat": None, "lng": None, "types": []
-}
+@dataclass(slots=True)
+class _Location:
+    """Session-scoped location memory (slotted: cheaper per-access than a dict)."""
+    input: str = ""
+    formatted: str = ""
+    lat: Optional[float] = None
+    lng: Optional[float] = None
+    types: List[str] = field(default_factory=list)
+
+_LAST_LOCATION = _Location()
 
 def set_user_location(location: str) -> dict:
     """Normalize and save the user's location for the current session only.
@@ -287,14 +419,12 @@ def set_user_location(location: str) -> dict:
     g = _geocode(location.strip())
     if not g.get("ok"):
         return {"status": "error", "message": f"Couldn't understand that location. {g.get('error','')}".strip()}
-    _LAST_LOCATION.update({
-        "input": location.strip(),
-        "formatted": g["formatted"],
-        "lat": g.get("lat"),
-        "lng": g.get("lng"),
-        "types": g.get("types", []),
-    })
-    return {"status": "ok", "saved_location": _LAST_LOCATION["formatted"], "note": g.get("note", "")}
+    _LAST_LOCATION.input = location.strip()
+    _LAST_LOCATION.formatted = g["formatted"]
+    _LAST_LOCATION.lat = g.get("lat")
+    _LAST_LOCATION.lng = g.get("lng")
+    _LAST_LOCATION.types = g.get("types", [])
+    return {"status": "ok", "saved_location": _LAST_LOCATION.formatted, "note": g.get("note", "")}
 
 def get_saved_location() -> dict:
     """Return the currently saved location (if any) for this session.
@@ -303,9 +433,16 @@ def get_saved_location() -> dict:
         {"status": "ok", ...full location dict...} if present,
         else {"status": "none", "message": "..."}.
     """
-    if not _LAST_LOCATION.get("formatted"):
+    if not _LAST_LOCATION.formatted:
         return {"status": "none", "message": "No saved location yet."}
-    return {"status": "ok", **_LAST_LOCATION}
+    return {
+        "status": "ok",
+        "input": _LAST_LOCATION.input,
+        "formatted": _LAST_LOCATION.formatted,
+        "lat": _LAST_LOCATION.lat,
+        "lng": _LAST_LOCATION.lng,
+        "types": _LAST_LOCATION.types,
+    }
 
 def clear_user_location() -> dict:
     """Clear any saved location for a fresh session/start.
@@ -313,18 +450,60 @@ def clear_user_location() -> dict:
     Returns:
         {"status": "ok", "message": "..."} after clearing.
     """
-    _LAST_LOCATION.update({
-        "input": "",
-        "formatted": "",
-        "lat": None,
-        "lng": None,
-        "types": [],
-    })
+    _LAST_LOCATION.input = ""
+    _LAST_LOCATION.formatted = ""
+    _LAST_LOCATION.lat = None
+    _LAST_LOCATION.lng = None
+    _LAST_LOCATION.types = []
     return {"status": "ok", "message": "Location cleared for this session."}
 
 # ------------------------
 # Google Maps / Places
 # ------------------------
+class _GeocodeError(Exception):
+    """Raised by `_geocode_raw` so failures are never memoized long-term."""
+
+# In-memory memo layers. TTL-bounded (unlike lru_cache) so a long-lived
+# process eventually re-verifies even "static" data, and sized so the hot
+# set (recent cities / place_ids) stays resident.
+_GEO_CACHE = TTLCache(ttl_sec=_GEOCODE_DISK_TTL, max_items=512)
+_DET_CACHE = TTLCache(ttl_sec=3600, max_items=2048)
+
+def _geocode_raw(location_norm: str) -> Tuple[str, Optional[float], Optional[float], Tuple[str, ...]]:
+    """Resolve a normalized location string → (formatted, lat, lng, types).
+
+    Memoized with a 24h TTL: repeated "set my location to X" turns become
+    O(1) dict hits instead of Maps round-trips. Checks the persistent disk
+    cache before HTTP. Raises `_GeocodeError` on failure (errors are not
+    cached here; `_http_get` negative-caches them briefly).
+    """
+    memo = _GEO_CACHE.get(location_norm)
+    if memo is not None:
+        return memo
+    disk_key = "geo|" + location_norm
+    if _DISK_CACHE is not None:
+        hit = _DISK_CACHE.get(disk_key, ttl_sec=_GEOCODE_DISK_TTL)
+        if hit is not None:
+            _GEO_CACHE.set(location_norm, hit)
+            return hit
+    data = _http_get("https://maps.googleapis.com/maps/api/geocode/json", {"address": location_norm, "key": MAPS_KEY})
+    if data.get("_error"):
+        raise _GeocodeError(data["_error"])
+    if data.get("status") != "OK" or not data.get("results"):
+        raise _GeocodeError(f"Geocoding failed: {data.get('status')}")
+    r0 = data["results"][0]
+    loc = r0["geometry"]["location"]
+    out = (
+        r0.get("formatted_address", location_norm),
+        loc.get("lat"),
+        loc.get("lng"),
+        tuple(r0.get("types", ())),
+    )
+    _GEO_CACHE.set(location_norm, out)
+    if _DISK_CACHE is not None:
+        _DISK_CACHE.set(disk_key, out)
+    return out
+
 def _geocode(location: str) -> Dict[str, Any]:
     """Geocode free text → {formatted, lat, lng, types}.
 
@@ -336,29 +515,27 @@ def _geocode(location: str) -> Dict[str, Any]:
             "ok": True, "formatted": location.strip(), "lat": None, "lng": None, "types": [],
             "note": "No GOOGLE_MAPS_API_KEY set; using fallback."
         }
-    data = _http_get("https://maps.googleapis.com/maps/api/geocode/json", {"address": location, "key": MAPS_KEY})
-    if data.get("_error"):
-        return {"ok": False, "error": data["_error"]}
-    if data.get("status") != "OK" or not data.get("results"):
-        return {"ok": False, "error": f"Geocoding failed: {data.get('status')}"}
-    r0 = data["results"][0]
-    loc = r0["geometry"]["location"]
-    return {
-        "ok": True,
-        "formatted": r0.get("formatted_address", location),
-        "lat": loc.get("lat"),
-        "lng": loc.get("lng"),
-        "types": r0.get("types", []),
-    }
+    try:
+        formatted, lat, lng, types = _geocode_raw(_norm(location))
+    except _GeocodeError as e:
+        return {"ok": False, "error": str(e)}
+    return {"ok": True, "formatted": formatted, "lat": lat, "lng": lng, "types": list(types)}
+
+def _nearby_search(lat: float, lng: float, radius_m: int = 0) -> List[Dict[str, Any]]:
+    """Google Places Nearby Search for clinics/doctors/hospitals near (lat,lng).
 
-def _nearby_search(lat: float, lng: float, radius_m: int) -> List[Dict[str, Any]]:
-    """Google Places Nearby Search for clinics/doctors/hospitals near (lat,lng)."""
+    With no radius the API's rankby=distance mode is used: one call returns
+    results ordered by proximity, replacing the old expanding-radius probes.
+    """
     params = {
         "location": f"{lat},{lng}",
-        "radius": radius_m,
         "keyword": "clinic hospital urgent care doctor",
         "key": MAPS_KEY
     }
+    if radius_m:
+        params["radius"] = radius_m
+    else:
+        params["rankby"] = "distance"
     data = _http_get("https://maps.googleapis.com/maps/api/place/nearbysearch/json", params)
     if data.get("_error") or data.get("status") not in ("OK", "ZERO_RESULTS"):
         return []
@@ -377,6 +554,77 @@ def _nearby_search(lat: float, lng: float, radius_m: int) -> List[Dict[str, Any]
         })
     return out
 
+# Places API (New) v1: one searchNearby POST returns phone/website/maps-URL
+# for every result via the field mask, collapsing the legacy N+1 pattern
+# (nearbysearch + one Details call per place) into a single round-trip.
+_PLACES_V1_URL = "https://places.googleapis.com/v1/places:searchNearby"
+_PLACES_V1_FIELD_MASK = ",".join((
+    "places.id",
+    "places.displayName",
+    "places.formattedAddress",
+    "places.rating",
+    "places.internationalPhoneNumber",
+    "places.websiteUri",
+    "places.googleMapsUri",
+    "places.currentOpeningHours.openNow",
+    "places.location",
+))
+
+def _nearby_search_v1(lat: float, lng: float, max_results: int,
+                      radius_m: int = 50000) -> Optional[List[Dict[str, Any]]]:
+    """Places v1 searchNearby with contact fields inlined.
+
+    Returns result dicts already carrying phone/website (no Details follow-up
+    needed), or None when the v1 endpoint is unavailable for this key so the
+    caller can fall back to the legacy nearbysearch path.
+    """
+    # Endpoint-level negative cache: keys without the new Places API enabled
+    # fail every POST (403/404), and without this flag each cache miss paid
+    # the dead v1 round-trip before falling back to legacy nearbysearch.
+    if _HTTP_CACHE.get(("places_v1_unavailable",)) is not None:
+        return None
+    key = ("places_v1", lat, lng, max_results, radius_m)
+    cached = _HTTP_CACHE.get(key)
+    if cached is not None:
+        return cached
+    body = {
+        "includedTypes": ["hospital", "doctor"],
+        "maxResultCount": max_results,
+        "rankPreference": "DISTANCE",
+        "locationRestriction": {
+            "circle": {"center": {"latitude": lat, "longitude": lng}, "radius": radius_m}
+        },
+    }
+    headers = {"X-Goog-Api-Key": MAPS_KEY, "X-Goog-FieldMask": _PLACES_V1_FIELD_MASK}
+    try:
+        r = _get_http_session().post(_PLACES_V1_URL, json=body, headers=headers, timeout=_HTTP_TIMEOUT)
+        r.raise_for_status()
+        data = _decode_json(r)
+    except Exception:
+        # Remember the outage briefly so the fallback goes straight to the
+        # legacy path until the TTL expires, like other failed Maps lookups.
+        _HTTP_CACHE.set(("places_v1_unavailable",), True, ttl=_NEG_TTL_SEC)
+        return None
+    out: List[Dict[str, Any]] = []
+    for p in data.get("places", []):
+        pid = (p.get("id") or "").removeprefix("places/")
+        loc = p.get("location") or {}
+        out.append({
+            "name": (p.get("displayName") or {}).get("text"),
+            "address": p.get("formattedAddress"),
+            "rating": p.get("rating"),
+            "place_id": pid or None,
+            "phone": p.get("internationalPhoneNumber"),
+            "website": p.get("websiteUri"),
+            "google_url": p.get("googleMapsUri"),
+            "open_now": (p.get("currentOpeningHours") or {}).get("openNow"),
+            "lat": loc.get("latitude"),
+            "lng": loc.get("longitude"),
+        })
+    # Empty result sets get the short negative TTL, like ZERO_RESULTS.
+    _HTTP_CACHE.set(key, out, ttl=None if out else _NEG_TTL_SEC)
+    return out
+
 def _text_search(query: str) -> List[Dict[str, Any]]:
     """Google Places Text Search fallback (e.g., for broad city/region queries)."""
     data = _http_get("https://maps.googleapis.com/maps/api/place/textsearch/json", {"query": query, "key": MAPS_KEY})
@@ -401,17 +649,71 @@ def _place_details(place_id: str) -> Dict[str, Any]:
     """Google Place Details → phone, website, canonical Google URL."""
     if not MAPS_KEY or not place_id:
         return {}
+    memo = _DET_CACHE.get(place_id)
+    if memo is not None:
+        return memo
+    disk_key = "det|" + place_id
+    if _DISK_CACHE is not None:
+        hit = _DISK_CACHE.get(disk_key, ttl_sec=_DETAILS_DISK_TTL)
+        if hit is not None:
+            _DET_CACHE.set(place_id, hit)
+            return hit
     params = {
         "place_id": place_id,
-        "fields": "formatted_phone_number,international_phone_number,website,url",
+        # Minimal billed field set: international_phone_number duplicates the
+        # formatted number, and the canonical `url` field is dropped because
+        # callers already construct a place_id Maps link locally.
+        "fields": "formatted_phone_number,website",
         "key": MAPS_KEY
     }
     data = _http_get("https://maps.googleapis.com/maps/api/place/details/json", params)
     if data.get("_error") or data.get("status") not in ("OK",):
         return {}
     r = (data.get("result") or {})
-    phone = r.get("formatted_phone_number") or r.get("international_phone_number")
-    return {"phone": phone, "website": r.get("website"), "google_url": r.get("url")}
+    out = {"phone": r.get("formatted_phone_number"), "website": r.get("website")}
+    _DET_CACHE.set(place_id, out)
+    if _DISK_CACHE is not None:
+        _DISK_CACHE.set(disk_key, out)
+    return out
+
+@dataclass(slots=True)
+class _Place:
+    """One enriched healthcare place (slotted: lighter than an 11-key dict).
+
+    Cached by reference in `_PLACES_CACHE`; converted to plain dicts only at
+    the tool boundary so ADK still sees simple JSON-shaped values.
+    """
+    name: Optional[str] = None
+    address: Optional[str] = None
+    rating: Optional[float] = None
+    phone: Optional[str] = None
+    tel_url: Optional[str] = None
+    website: Optional[str] = None
+    website_domain: Optional[str] = None
+    google_url: Optional[str] = None
+    open_now: Optional[bool] = None
+    lat: Optional[float] = None
+    lng: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Flat dict for the tool boundary.
+
+        `dataclasses.asdict` recurses and deep-copies every value; the fields
+        here are all scalars, so a direct build skips that machinery.
+        """
+        return {
+            "name": self.name,
+            "address": self.address,
+            "rating": self.rating,
+            "phone": self.phone,
+            "tel_url": self.tel_url,
+            "website": self.website,
+            "website_domain": self.website_domain,
+            "google_url": self.google_url,
+            "open_now": self.open_now,
+            "lat": self.lat,
+            "lng": self.lng,
+        }
 
 def find_nearby_healthcare(location: str = "", max_results: int = 3) -> List[Dict[str, Any]]:
     """Return a small list of nearby healthcare options enriched with links.
@@ -428,9 +730,9 @@ def find_nearby_healthcare(location: str = "", max_results: int = 3) -> List[Dic
     """
     if location and location.strip():
         set_user_location(location)
-    loc = _LAST_LOCATION.get("formatted")
-    lat = _LAST_LOCATION.get("lat")
-    lng = _LAST_LOCATION.get("lng")
+    loc = _LAST_LOCATION.formatted
+    lat = _LAST_LOCATION.lat
+    lng = _LAST_LOCATION.lng
 
     # No Maps key → static fallback
     if not MAPS_KEY:
@@ -441,46 +743,77 @@ def find_nearby_healthcare(location: str = "", max_results: int = 3) -> List[Dic
             {"name": "Urgent Care Center", "address": place},
         ][:max_results]
 
-    cache_key = f"nearby|{lat}|{lng}|{loc}|{max_results}"
+    cache_key = ("nearby", lat, lng, loc, max_results)
     if lat and lng:
         cached = _PLACES_CACHE.get(cache_key)
         if cached:
-            return cached
+            return [p.to_dict() for p in cached]
 
     results: List[Dict[str, Any]] = []
+    enriched_inline = False
     if lat and lng:
-        for r_m in (8000, 25000, 50000):
-            results = _nearby_search(lat, lng, r_m)
-            if results:
-                break
+        # Preferred: one Places v1 call that already includes phone/website,
+        # so no Details fan-out is needed afterwards.
+        v1 = _nearby_search_v1(lat, lng, max_results)
+        if v1:
+            results = v1
+            enriched_inline = True
+        elif v1 is None:
+            # v1 unavailable (endpoint disabled for this key, network error):
+            # legacy single rankby=distance call, wide-radius retry if empty.
+            results = _nearby_search(lat, lng)
+            if not results:
+                results = _nearby_search(lat, lng, 50000)
     if not results:
         q_place = loc or (location or "")
         results = _text_search(f"clinic OR urgent care OR hospital in {q_place}")
     if not results:
         return [{"note": "No healthcare places returned. Try a specific city or a zip/postal code."}]
 
-    enriched: List[Dict[str, Any]] = []
-    for r in results[:max_results]:
-        det = _place_details(r.get("place_id") or "")
-        phone = det.get("phone")
-        google_url = det.get("google_url") or r.get("google_url")
-        website = det.get("website")
-        item = {
-            "name": r.get("name"),
-            "address": r.get("address"),
-            "rating": r.get("rating"),
-            "phone": phone,
-            "tel_url": _tel_url(phone),
-            "website": website,
-            "website_domain": _domain(website),
-            "google_url": google_url,
-            "open_now": r.get("open_now"),
-            "lat": r.get("lat"),
-            "lng": r.get("lng"),
-        }
-        enriched.append(item)
+    top = results[:max_results]
+    # Legacy results need a Details call per place for contact info; those are
+    # independent HTTP round-trips (~100-300ms each), so fan them out and the
+    # wall time is ~1 RTT instead of N sequential RTTs. v1 results already
+    # carry phone/website inline and skip this entirely.
+    details: Dict[str, Dict[str, Any]] = {}
+    if not enriched_inline:
+        place_ids = [r["place_id"] for r in top if r.get("place_id")]
+        if place_ids:
+            with ThreadPoolExecutor(max_workers=min(8, len(place_ids))) as ex:
+                details = dict(zip(place_ids, ex.map(_place_details, place_ids)))
+
+    enriched: List[_Place] = []
+    for r in top:
+        det = details.get(r.get("place_id") or "", {})
+        phone = r.get("phone") or det.get("phone")
+        google_url = r.get("google_url")
+        website = r.get("website") or det.get("website")
+        enriched.append(_Place(
+            name=r.get("name"),
+            address=r.get("address"),
+            rating=r.get("rating"),
+            phone=phone,
+            tel_url=_tel_url(phone),
+            website=website,
+            website_domain=_domain(website),
+            google_url=google_url,
+            open_now=r.get("open_now"),
+            lat=r.get("lat"),
+            lng=r.get("lng"),
+        ))
     _PLACES_CACHE.set(cache_key, enriched)
-    return enriched
+    return [p.to_dict() for p in enriched]
+
+async def find_nearby_healthcare_async(location: str = "", max_results: int = 3) -> List[Dict[str, Any]]:
+    """Async wrapper for event-loop callers (e.g. ADK async runners).
+
+    The Maps chain (geocode → nearby → N details) is blocking I/O; running it
+    in a worker thread keeps the loop free to serve other sessions while the
+    sync path — with its shared pooled session, caches, and details fan-out —
+    stays the single implementation.
+    """
+    import asyncio
+    return await asyncio.to_thread(find_nearby_healthcare, location, max_results)
 
 # ------------------------
 # Costs & Booking
@@ -492,6 +825,8 @@ _COST_TABLE = {
     "strep_test": {"insured": "USD 0–40", "self_pay": "USD 20–80"},
     "urgent_care": {"insured": "USD 50–150 copay", "self_pay": "USD 120–350"},
 }
+# Display labels folded once at import ("clinic_visit" → "clinic visit").
+_ITEM_LABELS = {k: k.replace("_", " ") for k in _COST_TABLE}
 
 def estimate_cost(has_insurance: bool, suspected: str = "") -> dict:
     """Return a coarse cost snapshot for common clinic/urgent-care scenarios.
@@ -510,16 +845,36 @@ def estimate_cost(has_insurance: bool, suspected: str = "") -> dict:
         }
     """
     plan = "insured" if has_insurance else "self_pay"
+    s = (suspected or "").strip().lower()
+    venue, venue_hint, est = _estimate_cost_cached(plan, s)
+    # Rebuild mutable dicts per call; the cache holds only immutable tuples,
+    # so callers can't alias each other's results.
+    return {
+        "insurance": plan,
+        "suggested_venue": venue,
+        "venue_typical": venue_hint,
+        "items": [{"item": name, "typical": typical} for name, typical in est],
+    }
+
+@functools.lru_cache(maxsize=256)
+def _estimate_cost_cached(plan: str, s: str) -> Tuple[str, str, Tuple[Tuple[str, str], ...]]:
+    """Pure (plan, normalized text) → (venue, venue_typical, item tuples).
+
+    Users stepping through the numbered menu re-ask with identical inputs, so
+    memoizing collapses the keyword scans and table lookups to a hash hit.
+    """
+    hits = set(_SX_RE.findall(s))
     items = ["clinic_visit"]
-    s = (suspected or "").lower()
-    if "flu" in s:
+    if "flu" in hits:
         items.append("flu_test")
-    if "strep" in s or "sore throat" in s:
+    if "strep" in hits or "sore throat" in hits:
         items.append("strep_test")
-    est = [{"item": it.replace("_", " "), "typical": _COST_TABLE[it][plan]} for it in items if it in _COST_TABLE]
-    venue = "urgent care" if ("severe" in s or "chest pain" in s) else "clinic"
+    est = tuple(
+        (_ITEM_LABELS[it], _COST_TABLE[it][plan]) for it in items if it in _COST_TABLE
+    )
+    venue = "urgent care" if hits & {"severe", "chest pain"} else "clinic"
     venue_hint = _COST_TABLE["urgent_care" if venue == "urgent care" else "clinic_visit"][plan]
-    return {"insurance": plan, "suggested_venue": venue, "venue_typical": venue_hint, "items": est}
+    return venue, venue_hint, est
 
 def book_appointment(clinic_name: str, datetime_iso: str, reason: str = "") -> str:
     """Return a synthetic confirmation string for a “booked” appointment.
@@ -532,11 +887,14 @@ def book_appointment(clinic_name: str, datetime_iso: str, reason: str = "") -> s
     Returns:
         Confirmation text (including a short ID) or guidance to fix the date format.
     """
+    if not _ISO_RE.match(datetime_iso or ""):
+        return "Please provide a valid ISO date/time, e.g., 2025-09-16T15:30:00."
     try:
         _ = datetime.fromisoformat(datetime_iso)
     except Exception:
+        # Right shape but impossible date (e.g. month 13).
         return "Please provide a valid ISO date/time, e.g., 2025-09-16T15:30:00."
-    appt_id = "APT-" + uuid.uuid4().hex[:8].upper()
+    appt_id = _short_id("APT")
     return f"Booked a tentative appointment with **{clinic_name}** on **{datetime_iso}** (ID: {appt_id})."
 
 # ------------------------
@@ -580,15 +938,15 @@ def what_if_check(question_text: str) -> dict:
     t = _norm(question_text)
     risk = "low"
     reasons: List[str] = []
-    actions: List[str] = ["Monitor symptoms", "Hydrate and rest", "Seek care if symptoms worsen"]
+    actions: List[str] = list(_WHATIF_DEFAULT_ACTIONS)
 
     # Very simple illustrative rules (extend carefully)
-    if re.search(r"\b39(\.|,)?\s?c|102(\.|,)?\s?f|high fever\b", t):
+    if _WHATIF_FEVER_RE.search(t):
         risk = "moderate"; reasons.append("High fever can signal infection.")
         actions.insert(0, "Consider clinic evaluation within 24–48h")
-    if re.search(r"\bchest pain|severe trouble breathing|shortness of breath\b", t):
+    if _WHATIF_EMERGENCY_RE.search(t):
         risk = "high"; reasons.append("Potential cardiopulmonary emergency.")
-        actions = ["Seek emergency care now", "Avoid exertion", "Do not delay"]
+        actions = list(_WHATIF_EMERGENCY_ACTIONS)
 
     EVIDENCE.add("whatif_rules", f"risk={risk}, reasons={'; '.join(reasons) or 'none'}")
     return {"risk": risk, "reasons": reasons, "actions": actions}
@@ -613,6 +971,23 @@ def _load_meds_db() -> None:
     # Try local CSV path first
     csv_path = os.getenv("MEDS_DATA_CSV")  # e.g., /app/data/meds.csv
     if csv_path and os.path.exists(csv_path):
+        # A compiled pickle sits beside the CSV, keyed by (mtime, size), so
+        # warm starts skip the row-by-row CSV parse entirely.
+        pkl_path = csv_path + ".pkl"
+        try:
+            sig = (os.path.getmtime(csv_path), os.path.getsize(csv_path))
+        except OSError:
+            sig = None
+        if sig is not None and os.path.exists(pkl_path):
+            try:
+                import pickle
+                with open(pkl_path, "rb") as f:
+                    cached_sig, cached_db = pickle.load(f)
+                if cached_sig == sig:
+                    _MEDS_DB = cached_db
+                    return
+            except Exception:
+                pass  # stale/corrupt pickle → fall through to CSV parse
         try:
             with open(csv_path, "r", newline="", encoding="utf-8") as f:
                 reader = csv.DictReader(f)
@@ -624,6 +999,13 @@ def _load_meds_db() -> None:
                     serious = [x.strip() for x in (row.get("serious_side_effects", "")).split("|") if x.strip()]
                     inter = [x.strip() for x in (row.get("interactions", "")).split("|") if x.strip()]
                     _MEDS_DB[name] = {"common": common, "serious": serious, "interactions": inter, "source": "csv"}
+            if _MEDS_DB and sig is not None:
+                try:
+                    import pickle
+                    with open(pkl_path, "wb") as f:
+                        pickle.dump((sig, _MEDS_DB), f, protocol=pickle.HIGHEST_PROTOCOL)
+                except Exception:
+                    pass  # cache write is best-effort
         except Exception as e:
             EVIDENCE.add("medsx_dataset", f"csv error: {e}")
 
@@ -650,6 +1032,16 @@ def _load_meds_db() -> None:
             },
         }
 
+# Every meds check needs the DB, so load it eagerly at import time; the
+# read-only proxy lets the hot path skip the loaded-yet branch entirely.
+_load_meds_db()
+MEDS_DB: Mapping[str, Dict[str, Any]] = MappingProxyType(_MEDS_DB)
+
+# Token shape for med names in free text: word chars with inner spaces/hyphens.
+_MEDS_TOKEN_RE = re.compile(r"[a-z][a-z0-9 \-]*[a-z0-9]|[a-z]")
+# Tiny canonicalization map (extend carefully).
+_MEDS_CANON = {"acetaminophen": "paracetamol"}
+
 def _normalize_meds_list(inp) -> List[str]:
     """Normalize and deduplicate medication names.
 
@@ -660,27 +1052,15 @@ def _normalize_meds_list(inp) -> List[str]:
     Returns:
         List of canonicalized med names (lowercase).
     """
-    if isinstance(inp, list):
-        parts = inp
-    else:
-        parts = re.split(r"[,\n;]+", str(inp or ""))
-    meds = []
-    for p in parts:
-        n = _norm(p)
-        if not n:
-            continue
-        # Example canonicalization
-        if n == "acetaminophen":
-            n = "paracetamol"
-        meds.append(n)
-    # De-duplicate while preserving order
-    seen = set()
-    out: List[str] = []
-    for m in meds:
-        if m not in seen:
-            seen.add(m)
-            out.append(m)
-    return out
+    text = " , ".join(str(p) for p in inp) if isinstance(inp, list) else str(inp or "")
+    # One C-level regex walk extracts trimmed tokens; separators (commas,
+    # semicolons, newlines) fall outside the token class.
+    tokens = (
+        _MEDS_CANON.get(tok, tok)
+        for tok in (m.group().strip() for m in _MEDS_TOKEN_RE.finditer(text.lower()))
+    )
+    # dict.fromkeys de-duplicates while preserving first-seen order.
+    return list(dict.fromkeys(tokens))
 
 def meds_side_effects_check(meds: List[str], file_text: str = "") -> dict:
     """Merge side-effects and interactions for one or more medications.
@@ -699,45 +1079,38 @@ def meds_side_effects_check(meds: List[str], file_text: str = "") -> dict:
           "details": [{"drug":..., "found": bool, "source": "csv|builtin"?, ...}]
         }
     """
-    _load_meds_db()
-    assert _MEDS_DB is not None
-
-    all_names = _normalize_meds_list(meds)
+    # Merge list input and any meds found in `file_text`, then tokenize and
+    # de-duplicate in a single pass.
+    inp = list(meds or [])
     if file_text:
-        # Optionally merge any meds found in `file_text`
-        all_names.extend(_normalize_meds_list(file_text))
-        all_names = _normalize_meds_list(all_names)
+        inp.append(file_text)
+    all_names = _normalize_meds_list(inp)
 
     if not all_names:
         return {"status": "error", "message": "No medication names detected."}
 
-    merged_common: List[str] = []
-    merged_serious: List[str] = []
-    merged_interactions: List[str] = []
+    # Dicts as ordered sets: O(1) membership vs. the old O(n) list scans.
+    merged_common: Dict[str, None] = {}
+    merged_serious: Dict[str, None] = {}
+    merged_interactions: Dict[str, None] = {}
     details: List[dict] = []
 
     for name in all_names:
-        rec = _MEDS_DB.get(name)
+        rec = MEDS_DB.get(name)
         if not rec:
             details.append({"drug": name, "found": False})
             continue
         details.append({"drug": name, "found": True, "source": rec.get("source")})
-        for x in rec.get("common", []):
-            if x not in merged_common:
-                merged_common.append(x)
-        for x in rec.get("serious", []):
-            if x not in merged_serious:
-                merged_serious.append(x)
-        for x in rec.get("interactions", []):
-            if x not in merged_interactions:
-                merged_interactions.append(x)
+        merged_common.update(dict.fromkeys(rec.get("common", ())))
+        merged_serious.update(dict.fromkeys(rec.get("serious", ())))
+        merged_interactions.update(dict.fromkeys(rec.get("interactions", ())))
 
     EVIDENCE.add("medsx_dataset", f"meds={all_names}, sources=mixed")
     return {
         "medications": all_names,
-        "common_side_effects": merged_common[:12],
-        "serious_side_effects": merged_serious[:12],
-        "possible_interactions": merged_interactions[:12],
+        "common_side_effects": list(merged_common)[:12],
+        "serious_side_effects": list(merged_serious)[:12],
+        "possible_interactions": list(merged_interactions)[:12],
         "details": details,
     }
 
@@ -752,7 +1125,22 @@ def meds_side_effects_check_text(meds_text: str, file_text: str = "") -> dict:
 # ------------------------
 # Simple timeline (in-memory, non-PHI if configured)
 # ------------------------
-_TIMELINE: List[Dict[str, str]] = []
+# Bounded, most-recent-first: appendleft is O(1) and maxlen evicts the oldest
+# entry automatically, so long-running containers can't leak timeline memory.
+_TIMELINE: deque[Dict[str, str]] = deque(maxlen=100)
+
+# (epoch second, rendered ISO string) — timestamps have 1s precision, so
+# bursts of saves within the same second reuse one formatted string.
+_TS_MEMO: Tuple[int, str] = (0, "")
+
+def _utc_ts() -> str:
+    """UTC timestamp like 2025-01-01T12:00:00Z, memoized per second."""
+    global _TS_MEMO
+    now = int(time.time())
+    if _TS_MEMO[0] != now:
+        iso = datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z")
+        _TS_MEMO = (now, iso)
+    return _TS_MEMO[1]
 
 def save_timeline(kind: str, details: Dict[str, str] | None = None) -> dict:
     """Append a lightweight timeline event (string-only details).
@@ -774,14 +1162,12 @@ def save_timeline(kind: str, details: Dict[str, str] | None = None) -> dict:
     # enforce string-only values for schema simplicity
     d = {str(k): str(v) for k, v in d.items()}
     evt = {
-        "id": "TL-" + uuid.uuid4().hex[:8].upper(),
-        "ts": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "id": _short_id("TL"),
+        "ts": _utc_ts(),
         "kind": str(kind),
         "details": json.dumps(d, ensure_ascii=False),
     }
-    _TIMELINE.insert(0, evt)
-    if len(_TIMELINE) > 100:
-        _TIMELINE.pop()
+    _TIMELINE.appendleft(evt)
     return {"status": "ok", "event": evt}
 
 def timeline_list() -> List[Dict[str, str]]:
@@ -0,0 +1,76 @@
+# app/assistant_tools_cache.py
+from __future__ import annotations
+import os, pickle, sqlite3, threading, time
+from typing import Any, Optional
+
+"""
+assistant_tools_cache.py
+
+Purpose
+-------
+Optional SQLite-backed persistent cache for near-static Google Maps results
+(geocodes, place details). The in-memory `TTLCache` in `assistant_tools`
+dies with the process; geocodes for the same city and details for the same
+place_id are essentially static, so keeping them on disk turns cold-start
+cache misses into sub-millisecond reads and cuts Maps API spend.
+
+Design
+------
+* stdlib only (`sqlite3` + `pickle`); no new dependencies.
+* Single `kv` table: key -> (insert timestamp, pickled value). Callers pass
+  the TTL they consider fresh at read time, so one table can serve entries
+  with different lifetimes.
+* Best-effort: every operation swallows exceptions and degrades to a miss.
+  A broken/missing cache file must never break a tool call.
+* `PRAGMA journal_mode=WAL` + `synchronous=NORMAL` so concurrent readers
+  don't block the writer.
+
+Environment
+-----------
+    CARE_CACHE_DB: cache file path (default /tmp/careguide_cache.db)
+"""
+
+_DEFAULT_DB_PATH = "/tmp/careguide_cache.db"
+
+
+class SQLiteCache:
+    """Tiny persistent key/value cache with read-time TTL checks."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv("CARE_CACHE_DB", _DEFAULT_DB_PATH)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS kv (k TEXT PRIMARY KEY, ts REAL, v BLOB)")
+        self._conn.commit()
+
+    def get(self, k: str, ttl_sec: float) -> Any | None:
+        """Return the cached value if younger than `ttl_sec`; else None."""
+        try:
+            with self._lock:
+                row = self._conn.execute("SELECT ts, v FROM kv WHERE k = ?", (k,)).fetchone()
+            if not row:
+                return None
+            ts, blob = row
+            if time.time() - ts > ttl_sec:
+                with self._lock:
+                    self._conn.execute("DELETE FROM kv WHERE k = ?", (k,))
+                    self._conn.commit()
+                return None
+            return pickle.loads(blob)
+        except Exception:
+            return None
+
+    def set(self, k: str, v: Any) -> None:
+        """Insert/refresh a cache entry (best-effort; errors are swallowed)."""
+        try:
+            blob = pickle.dumps(v, protocol=pickle.HIGHEST_PROTOCOL)
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO kv (k, ts, v) VALUES (?, ?, ?)",
+                    (k, time.time(), blob),
+                )
+                self._conn.commit()
+        except Exception:
+            pass
@@ -1,26 +1,62 @@
 # app/evidence.py
 from __future__ import annotations
+import queue
+import threading
+from collections import deque
 from typing import List, Dict, Any
 from dataclasses import dataclass, field
 
-@dataclass
+@dataclass(slots=True)
 class EvidenceItem:
     source: str   # e.g., "dataset", "whatif_calc"
     detail: str   # short text to show
     extra: Dict[str, Any] = field(default_factory=dict)
 
 class EvidenceLog:
+    # Breadcrumbs are consumed every render; the cap only matters if a
+    # snapshot never happens, preventing unbounded growth in long sessions.
+    _MAXLEN = 256
+
     def __init__(self) -> None:
-        self._items: List[EvidenceItem] = []
+        self._items: deque[EvidenceItem] = deque(maxlen=self._MAXLEN)
+        # Tool calls can run on executor threads; serialize mutations so a
+        # snapshot never iterates a deque mid-append.
+        self._lock = threading.Lock()
+        # Hot-path producer queue: add() only enqueues a raw tuple (lock-free
+        # at the Python level); item construction is deferred to the drain.
+        self._pending: queue.SimpleQueue = queue.SimpleQueue()
 
     def add(self, source: str, detail: str, **extra: Any) -> None:
-        self._items.append(EvidenceItem(source=source, detail=detail, extra=extra))
+        self._pending.put_nowait((source, detail, extra))
+
+    def _drain(self) -> None:
+        """Move queued breadcrumbs into the deque. Caller holds the lock."""
+        while True:
+            try:
+                source, detail, extra = self._pending.get_nowait()
+            except queue.Empty:
+                break
+            self._items.append(EvidenceItem(source=source, detail=detail, extra=extra))
 
     def snapshot(self, clear: bool = True) -> List[Dict[str, Any]]:
-        out = [dict(source=i.source, detail=i.detail, **(i.extra or {})) for i in self._items]
-        if clear:
+        with self._lock:
+            self._drain()
+            if clear:
+                # O(1) swap instead of clearing in place; the dict building
+                # below then runs outside the lock on a private deque.
+                items = self._items
+                self._items = deque(maxlen=self._MAXLEN)
+            else:
+                # Copy under the lock: the live deque keeps receiving
+                # appends from _drain() on other threads, and iterating it
+                # unlocked would raise "deque mutated during iteration".
+                items = list(self._items)
+        return [dict(source=i.source, detail=i.detail, **(i.extra or {})) for i in items]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._drain()
             self._items.clear()
-        return out
 
 # Singleton used everywhere
 EVIDENCE = EvidenceLog()
@@ -1,8 +1,17 @@
 # app/i18n.py
 from __future__ import annotations
+from functools import lru_cache
 
 _LANG = "en"  # "en" | "es" | "fr" (extend)
 
+# Built once at import; phrase() used to reallocate this dict of dicts on
+# every call.
+_T = {
+    "en": {"menu_title":"What I can do (reply with a number):"},
+    "es": {"menu_title":"¿Qué puedo hacer? (responde con un número):"},
+    "fr": {"menu_title":"Ce que je peux faire (répondez par un numéro) :"},
+}
+
 def set_language(lang_code: str) -> dict:
     global _LANG
     lc = (lang_code or "").lower()
@@ -14,13 +23,12 @@ def set_language(lang_code: str) -> dict:
 def get_language() -> dict:
     return {"lang": _LANG}
 
+@lru_cache(maxsize=256)
+def _lookup(lang: str, key: str) -> str:
+    return _T.get(lang, _T["en"]).get(key, key)
+
 def phrase(key: str) -> dict:
     """
     Tiny dictionary for UX elements the model can choose to pull from.
     """
-    T = {
-        "en": {"menu_title":"What I can do (reply with a number):"},
-        "es": {"menu_title":"¿Qué puedo hacer? (responde con un número):"},
-        "fr": {"menu_title":"Ce que je peux faire (répondez par un numéro) :"},
-    }
-    return {"text": T.get(_LANG, T["en"]).get(key, key)}
+    return {"text": _lookup(_LANG, key)}
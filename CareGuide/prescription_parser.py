@@ -39,10 +39,10 @@ _DRUG_PATTERN = re.compile(
 
 # Common non-drug tokens often found on prescriptions that we should ignore.
 # This is a tiny seed list; extend as needed (e.g., "qhs", "od", "s/l").
-_STOPLIST = {
+_STOPLIST = frozenset({
     "take", "tab", "tablet", "capsule", "mg", "mcg", "ml",
     "dose", "daily", "bid", "tid", "qid", "po", "prn"
-}
+})
 
 
 def extract_meds_from_text(file_text: str) -> dict:
@@ -86,16 +86,18 @@ def extract_meds_from_text(file_text: str) -> dict:
     # Normalize line breaks so regex sees a continuous stream.
     t = (file_text or "").replace("\n", " ")
 
-    # Collect raw candidates (group 1 is the putative drug token).
-    cands = [m.group(1).lower() for m in _DRUG_PATTERN.finditer(t)]
-
-    # Filter and de-duplicate while preserving order.
+    # Single streaming pass: set-based dedupe keeps first-seen order without
+    # the old per-candidate list scan, and we stop reading the document once
+    # the 20-med payload cap is reached.
     meds: List[str] = []
-    for c in cands:
-        if c in _STOPLIST:
+    seen: set = set()
+    for m in _DRUG_PATTERN.finditer(t):
+        c = m.group(1).lower()
+        if c in _STOPLIST or c in seen:
             continue
-        if c not in meds:
-            meds.append(c)
+        seen.add(c)
+        meds.append(c)
+        if len(meds) == 20:
+            break
 
-    # Keep payload compact; callers can request more if needed.
-    return {"medications": meds[:20]}
+    return {"medications": meds}
@@ -1,6 +1,6 @@
 # app/rag_dataset.py
 from __future__ import annotations
-import os, io, csv, time
+import os, io, csv, time, threading
 from typing import List, Dict, Any, Tuple
 from dataclasses import dataclass
 from .config import TRIAGE_KB_GCS, TRIAGE_KB_LOCAL
@@ -21,7 +21,7 @@ for the CareGuide agent. This module:
 Design Notes
 ------------
 - Imports of heavy dependencies (NumPy / scikit-learn) are deferred until first
-  use via small helper functions (`_np`, `_sk_text`, `_sk_metrics`) to keep
+  use via small helper functions (`_np`, `_sk_text`) to keep
   import time fast and errors localized.
 - The knowledge base can live in:
     * Local path: `TRIAGE_KB_LOCAL` (preferred, fastest), or
@@ -54,14 +54,10 @@ def _np():
     return np
 
 def _sk_text():
-    """Defer import of scikit-learn's TfidfVectorizer until needed."""
-    from sklearn.feature_extraction.text import TfidfVectorizer
-    return TfidfVectorizer
-
-def _sk_metrics():
-    """Defer import of scikit-learn's cosine_similarity until needed."""
-    from sklearn.metrics.pairwise import cosine_similarity
-    return cosine_similarity
+    """Defer import of scikit-learn's text-vectorization stages until needed."""
+    from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+    from sklearn.pipeline import make_pipeline
+    return HashingVectorizer, TfidfTransformer, make_pipeline
 
 
 def _download_gcs_to_local(gcs_uri: str, local_path: str) -> bool:
@@ -101,7 +97,7 @@ def _download_gcs_to_local(gcs_uri: str, local_path: str) -> bool:
 
 
 # --- Data structures & globals ----------------------------------------------
-@dataclass
+@dataclass(slots=True)
 class KBRow:
     """
     A single knowledge base entry.
@@ -124,9 +120,14 @@ class KBRow:
 
 
 # Global singletons for the in-memory index
+_NP = None           # type: Any | None  # numpy, bound once when the index is ready
 _Vectorizer = None   # type: Any | None
 _MATRIX = None       # type: Any | None  # sparse matrix (n_samples x n_terms)
+_MATRIX_T = None     # type: Any | None  # CSR transpose, cached for query matmuls
 _ROWS: List[KBRow] = []  # raw KB rows
+# Serializes the one-time build so concurrent warm-up requests don't each
+# run a full vectorizer fit (double-checked in _build_index).
+_INIT_LOCK = threading.Lock()
 
 
 # --- Loading & indexing ------------------------------------------------------
@@ -158,6 +159,29 @@ def _load_rows() -> List[KBRow]:
     if not path:
         return rows
 
+    # Fast path: pandas reads and strips the columns in C, then the rows are
+    # assembled from plain zip iteration — much quicker than csv.DictReader's
+    # per-row dict building on large KBs. Falls back to the stdlib reader.
+    try:
+        import pandas as pd
+        df = pd.read_csv(path, dtype=str).fillna("")
+        by_lower = {c.lower(): c for c in df.columns}
+        def _col(aliases: Tuple[str, ...]) -> List[str]:
+            for a in aliases:
+                if a in by_lower:
+                    return df[by_lower[a]].str.strip().tolist()
+            return [""] * len(df)
+        conds = _col(("condition", "disease", "name"))
+        syms = _col(("symptoms", "symptom", "features"))
+        advs = _col(("advice", "self_care", "recommendations"))
+        urls = _col(("url", "link", "source"))
+        return [
+            KBRow(condition=c, symptoms=s, advice=a, url=(u or None))
+            for c, s, a, u in zip(conds, syms, advs, urls)
+        ]
+    except Exception:
+        pass
+
     with open(path, "r", encoding="utf-8", newline="") as f:
         reader = csv.DictReader(f)
 
@@ -182,6 +206,17 @@ def _load_rows() -> List[KBRow]:
             )
     return rows
 
+def _index_cache_path(csv_path: str) -> str:
+    """Sidecar path for the pickled index (beside the CSV, like the meds db)."""
+    return csv_path + ".idx.pkl"
+
+def _csv_sig(csv_path: str):
+    """(mtime, size) freshness signature for the local CSV, or None."""
+    try:
+        return (os.path.getmtime(csv_path), os.path.getsize(csv_path))
+    except OSError:
+        return None
+
 def _build_index() -> None:
     """
     Build (or no-op if already built) the TF-IDF index over KB rows.
@@ -194,10 +229,40 @@ def _build_index() -> None:
     -----
     - This is done lazily on first call to `rag_stats`/`rag_search`.
     - Uses unigrams and bigrams for simple breadth; adjust as needed.
+    - A pickled sidecar (<csv>.idx.pkl, keyed by the CSV's mtime/size) lets
+      warm starts skip the TF-IDF refit entirely; it is best-effort and a
+      stale or unreadable sidecar just falls through to a fresh fit.
     """
-    global _Vectorizer, _MATRIX, _ROWS
+    global _NP, _Vectorizer, _MATRIX, _MATRIX_T, _ROWS
     if _Vectorizer is not None and _MATRIX is not None and _ROWS:
         return
+    with _INIT_LOCK:
+        # Double-check after acquiring: a concurrent caller may have finished
+        # the build while we waited on the lock.
+        if _Vectorizer is not None and _MATRIX is not None and _ROWS:
+            return
+        _build_index_locked()
+
+def _build_index_locked() -> None:
+    """Do the actual load + fit. Caller holds `_INIT_LOCK`."""
+    global _NP, _Vectorizer, _MATRIX, _MATRIX_T, _ROWS
+    # Bind numpy as a module global once: the query path then reads _NP
+    # directly instead of re-running the lazy-import helper per search.
+    _NP = _np()
+
+    path = _ensure_local_csv()
+    sig = _csv_sig(path) if path else None
+    if sig is not None:
+        try:
+            import pickle
+            with open(_index_cache_path(path), "rb") as f:
+                cached_sig, rows, vec, mat = pickle.load(f)
+            if cached_sig == sig:
+                _ROWS, _Vectorizer, _MATRIX = rows, vec, mat
+                _MATRIX_T = _MATRIX.T.tocsr()
+                return
+        except Exception:
+            pass
 
     _ROWS = _load_rows()
     if not _ROWS:
@@ -206,13 +271,32 @@ def _build_index() -> None:
     # Concatenate fields to provide more context per row for TF-IDF.
     texts = [f"{r.condition} | {r.symptoms} | {r.advice}" for r in _ROWS]
 
-    TfidfVectorizer = _sk_text()
-    _Vectorizer = TfidfVectorizer(
-        min_df=1,
-        max_features=30000,
-        ngram_range=(1, 2),  # unigrams + bigrams
+    # Hashing pipeline instead of TfidfVectorizer: the first pass is a
+    # streaming hash (no vocabulary dict held in memory), and TfidfTransformer
+    # supplies the IDF weighting plus L2 norm on top.
+    HashingVectorizer, TfidfTransformer, make_pipeline = _sk_text()
+    _Vectorizer = make_pipeline(
+        HashingVectorizer(
+            n_features=2 ** 18,
+            ngram_range=(1, 2),  # unigrams + bigrams
+            alternate_sign=False,
+            norm=None,
+        ),
+        TfidfTransformer(),
     )
     _MATRIX = _Vectorizer.fit_transform(texts)
+    # TfidfTransformer L2-normalizes rows, so cosine similarity is just the
+    # sparse dot product against this cached transpose — no sklearn pairwise
+    # call, no densified intermediate.
+    _MATRIX_T = _MATRIX.T.tocsr()
+
+    if sig is not None:
+        try:
+            import pickle
+            with open(_index_cache_path(path), "wb") as f:
+                pickle.dump((sig, _ROWS, _Vectorizer, _MATRIX), f, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            pass
 
 
 # --- Public API --------------------------------------------------------------
@@ -267,13 +351,17 @@ def rag_search(query: str, top_k: int = 3) -> List[Dict[str, Any]]:
     if not _ROWS or _Vectorizer is None or _MATRIX is None:
         return []
 
-    # Vectorize the query and compute cosine similarity to all KB rows.
+    # Vectorize the query; cosine similarity reduces to a sparse dot product
+    # because TfidfVectorizer outputs L2-normalized rows.
     vec = _Vectorizer.transform([query])
-    cosine_similarity = _sk_metrics()
-    sims = cosine_similarity(vec, _MATRIX)[0]
-
-    # Arg-sort indices for top-k results (highest similarity first).
-    idx = sims.argsort()[-top_k:][::-1]
+    sims = (vec @ _MATRIX_T).toarray()[0]
+
+    # Top-k via argpartition: O(N) selection plus a k-element sort instead of
+    # an O(N log N) argsort over every row.
+    np = _NP
+    k = min(top_k, sims.shape[0])
+    part = np.argpartition(-sims, k - 1)[:k]
+    idx = part[np.argsort(-sims[part])]
 
     out: List[Dict[str, Any]] = []
     for i in idx:
@@ -1,6 +1,8 @@
 # app/risk_sim.py
 from __future__ import annotations
+import functools
 import re
+from typing import List, Tuple
 
 def risk_simulate(question_text: str, age_group: str = "", severity: str = "") -> dict:
     """
@@ -55,25 +57,39 @@ def risk_simulate(question_text: str, age_group: str = "", severity: str = "") -
       and are matched as simple substrings (current approach) or add
       appropriate normalization.
     """
-    # Normalize text for simple substring checks
+    # Normalize text for simple substring checks; the cached core then sees
+    # the same key for case variants and chat retries of the same question.
     t = (question_text or "").lower()
-
-    reasons = []
-    actions = []
+    band, reasons, actions = _risk_banding(t, age_group, severity)
+    # Keep payload compact (≤3 items each for clean rendering); rebuild lists
+    # so callers never mutate the cached tuples.
+    return {"band": band, "reasons": list(reasons[:3]), "actions": list(actions[:3])}
+
+
+# High-signal emergency terms (keep list concise & specific)
+_RED_TERMS = (
+    "chest pain",
+    "trouble breathing",
+    "shortness of breath",
+    "passed out",
+    "stroke",
+    "severe bleeding",
+)
+# Single compiled alternations: one linear scan each instead of a Python
+# substring check per term.
+_RED_RX = re.compile("|".join(map(re.escape, _RED_TERMS)))
+_WORSE_RX = re.compile(r"worsen|getting worse")
+
+
+@functools.lru_cache(maxsize=4096)
+def _risk_banding(t: str, age_group: str, severity: str) -> Tuple[str, Tuple[str, ...], Tuple[str, ...]]:
+    """Pure banding core over lowercased text; memoized on the full key."""
+    reasons: List[str] = []
+    actions: List[str] = []
     band = "low"
 
-    # High-signal emergency terms (keep list concise & specific)
-    red = [
-        "chest pain",
-        "trouble breathing",
-        "shortness of breath",
-        "passed out",
-        "stroke",
-        "severe bleeding",
-    ]
-
     # 1) Hard red flags → HIGH
-    if any(x in t for x in red):
+    if _RED_RX.search(t):
         band = "high"
         reasons.append("Contains emergency symptom keyword(s).")
         actions += [
@@ -82,7 +98,7 @@ def risk_simulate(question_text: str, age_group: str = "", severity: str = "") -
         ]
 
     # 2) Worsening trajectory → MODERATE (if not already HIGH)
-    elif "worsen" in t or "getting worse" in t:
+    elif _WORSE_RX.search(t):
         band = "moderate"
         reasons.append("Mentions worsening pattern.")
         actions += [
@@ -110,5 +126,4 @@ def risk_simulate(question_text: str, age_group: str = "", severity: str = "") -
         band = "moderate"
         reasons.append("User-reported severity is severe.")
 
-    # Keep payload compact (≤3 items each for clean rendering)
-    return {"band": band, "reasons": reasons[:3], "actions": actions[:3]}
+    return band, tuple(reasons), tuple(actions)
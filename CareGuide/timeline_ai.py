@@ -11,10 +11,20 @@ def timeline_insights() -> dict:
     items: List[Dict] = data.get("items", [])
     tips: List[str] = []
 
-    # Simple heuristics
-    had_urgent = any(i.get("type") == "emergency_flag" for i in items)
-    many_triages = sum(1 for i in items if i.get("type") == "triage") >= 3
-    has_appointment = any(i.get("type") == "appointment" for i in items)
+    # Simple heuristics, accumulated in one pass over the timeline instead
+    # of three separate scans.
+    had_urgent = False
+    triage_count = 0
+    has_appointment = False
+    for i in items:
+        t = i.get("type")
+        if t == "emergency_flag":
+            had_urgent = True
+        elif t == "triage":
+            triage_count += 1
+        elif t == "appointment":
+            has_appointment = True
+    many_triages = triage_count >= 3
 
     if had_urgent:
         tips.append("Add your emergency contacts to your phone favorites.")
@@ -1,8 +1,8 @@
 # app/triage.py
 from __future__ import annotations
-import json, re
+import functools, heapq, json, re
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from .evidence import EVIDENCE
 
 DATA_PATH = Path(__file__).parent / "data" / "conditions.json"
@@ -30,46 +30,116 @@ SYN = {
     "xerostomia": "dry mouth",
 }
 
+# Compiled once at import: a single alternation scans the text in one pass
+# instead of N independent re.search calls (each with its own cache lookup).
+_EMERGENCY_RX = re.compile("|".join(f"(?:{p})" for p in EMERGENCY_PATTERNS))
+# Term automaton for symptom_extract: canonical terms plus synonym spellings
+# in one union pattern (longest-first so "feverish" wins over "fever"),
+# mapped back to canonical terms via _TERM_MAP. One linear scan replaces the
+# per-term substring loop and the separate SYN .replace pass.
+_TERM_MAP = {s: s for s in SYMPTOM_TERMS}
+_TERM_MAP.update(SYN)
+_TERM_RX = re.compile("|".join(re.escape(k) for k in sorted(_TERM_MAP, key=len, reverse=True)))
+_NORM_RX = re.compile(r"\s+")
+# Anything _NORM_RX would actually rewrite: a whitespace run of 2+ or a
+# single non-space whitespace char. Clean chat text matches neither, so
+# _norm can skip the substitution machinery entirely on that path.
+_NORM_DIRTY_RX = re.compile(r"\s{2,}|[^\S ]")
+_DURATION_RX = re.compile(r"(for|since)\s+([\w\s\-]+?)(?:\.|,|;|$)")
+# Severity words are plain tokens, so classify with O(1) set intersections
+# over one tokenization pass; only the multi-word "10 out of 10" phrase
+# still needs a pattern scan ("10/10" survives tokenization intact).
+_TOKEN_RX = re.compile(r"[a-z0-9/]+")
+_MILD_TOKENS = frozenset({"mild", "slight"})
+_SEVERE_TOKENS = frozenset({"severe", "intense", "worst", "10/10"})
+_TEN_OF_TEN_RX = re.compile(r"10 out of 10")
+
 def _norm(s:str)->str:
-    return re.sub(r"\s+"," ",s.strip().lower())
+    s=s.strip().lower()
+    return _NORM_RX.sub(" ",s) if _NORM_DIRTY_RX.search(s) else s
 
 def red_flag_checker(text: str) -> str:
     t=_norm(text)
-    for pat in EMERGENCY_PATTERNS:
-        if re.search(pat, t):
-            return ("⚠️ This could be a medical emergency. Please seek **immediate** medical attention "
-                    "or call your local emergency number now.")
+    if _EMERGENCY_RX.search(t):
+        return ("⚠️ This could be a medical emergency. Please seek **immediate** medical attention "
+                "or call your local emergency number now.")
     return ""
 
 def symptom_extract(text: str) -> dict:
     t=_norm(text)
-    # synonym normalize
-    for k,v in SYN.items():
-        t = t.replace(k, v)
-    found=[s for s in SYMPTOM_TERMS if s in t]
-    m=re.search(r"(for|since)\s+([\w\s\-]+?)(?:\.|,|;|$)", t)
+    found={_TERM_MAP[m.group(0)] for m in _TERM_RX.finditer(t)}
+    m=_DURATION_RX.search(t)
     duration = m.group(2).strip() if m else ""
-    severity="moderate"
-    if re.search(r"\b(mild|slight)\b", t): severity="mild"
-    if re.search(r"\b(severe|intense|worst|10\/10|10 out of 10)\b", t): severity="severe"
-    return {"symptoms":sorted(set(found)),"duration":duration,"severity":severity}
+    tokens=set(_TOKEN_RX.findall(t))
+    if tokens & _SEVERE_TOKENS or _TEN_OF_TEN_RX.search(t):
+        severity="severe"
+    elif tokens & _MILD_TOKENS:
+        severity="mild"
+    else:
+        severity="moderate"
+    return {"symptoms":sorted(found),"duration":duration,"severity":severity}
 
+# The KB JSON files are read and parsed once per process; kb_reload clears
+# these caches when the source changes.
+@functools.lru_cache(maxsize=1)
 def _load_conditions():
     return json.loads(DATA_PATH.read_text()) if DATA_PATH.exists() else []
 
+@functools.lru_cache(maxsize=1)
 def _load_sym_kb():
     if SYMPTOM_KB_PATH.exists():
         return json.loads(SYMPTOM_KB_PATH.read_text())
     return {}
 
-def _score(symptoms:List[str], c:dict)->float:
-    a=set(symptoms); b=set([s.lower() for s in c.get("symptoms",[])])
-    return 0.0 if not a or not b else len(a & b)/len(a | b)
+@functools.lru_cache(maxsize=1)
+def _symptom_bits() -> Dict[str, int]:
+    """Symptom vocabulary -> single-bit mask, built from the conditions DB."""
+    bits: Dict[str, int] = {}
+    for c in _load_conditions():
+        for s in c.get("symptoms", []):
+            s = s.lower()
+            if s not in bits:
+                bits[s] = 1 << len(bits)
+    return bits
+
+@functools.lru_cache(maxsize=1)
+def _conditions_indexed() -> List[Tuple[dict, int]]:
+    """Conditions paired with precomputed symptom bitmasks for scoring."""
+    bits = _symptom_bits()
+    out: List[Tuple[dict, int]] = []
+    for c in _load_conditions():
+        mask = 0
+        for s in c.get("symptoms", []):
+            mask |= bits[s.lower()]
+        out.append((c, mask))
+    return out
+
+def _score(a:int, extra:int, b:int)->float:
+    # Jaccard over bitmasks: C-level popcounts instead of per-condition set
+    # building. `extra` counts user symptoms outside the KB vocabulary, which
+    # still belong in the union denominator.
+    if not (a or extra) or not b:
+        return 0.0
+    return (a & b).bit_count() / ((a | b).bit_count() + extra)
 
 def rules_lookup(symptoms:List[str], duration:str="", severity:str="", age_group:str|None=None)->dict:
-    db=_load_conditions()
-    scored=sorted([{"item":c,"score":_score(symptoms,c)} for c in db], key=lambda x:x["score"], reverse=True)
-    top=[s for s in scored if s["score"]>=0.15][:3]
+    bits=_symptom_bits()
+    a=0; unknown=set()
+    for s in symptoms:
+        bit=bits.get(s)
+        if bit:
+            a|=bit
+        else:
+            unknown.add(s)
+    extra=len(unknown)
+    # Top-3 selection instead of sorting the whole scored DB: O(N log 3),
+    # with the score floor applied inside the generator. nlargest breaks
+    # ties by first-seen order, matching the old stable sort.
+    top=heapq.nlargest(
+        3,
+        ({"item":c,"score":sc} for c,mask in _conditions_indexed() if (sc:=_score(a,extra,mask))>=0.15),
+        key=lambda x:x["score"],
+    )
     # light age filter (if metadata exists in JSON)
     results=[]
     for s in top:
@@ -89,46 +159,79 @@ def rules_lookup(symptoms:List[str], duration:str="", severity:str="", age_group
         EVIDENCE.add("triage_rules", f"rules matched {len(results)} candidates")
     return {"matches":results,"duration":duration,"severity":severity}
 
+@functools.lru_cache(maxsize=1)
+def _sym_kb_indexed() -> Dict[str, tuple]:
+    """Inverted index: normalized KB key -> tuple of condition hints."""
+    return {_norm(k): tuple(vals) for k, vals in _load_sym_kb().items() if vals}
+
 def _kb_lookup(symptoms: List[str]) -> List[str]:
-    kb=_load_sym_kb(); out=[]
-    joined=" ".join(symptoms)
-    for k,vals in kb.items():
-        if k in joined and vals:
-            for v in vals:
-                if v not in out: out.append(v)
+    idx=_sym_kb_indexed()
+    if not idx:
+        return []
+    out=[]; seen=set()
+    for s in symptoms:
+        # Probe the symptom itself, plus its words so a single-word KB key
+        # like "fever" still hits multi-word symptoms like "low-grade fever"
+        # (the old joined-string substring behavior) without scanning every
+        # KB key per call.
+        probes = (s,) if " " not in s else (s, *s.split())
+        for p in probes:
+            for c in idx.get(p, ()):
+                if c not in seen:
+                    seen.add(c); out.append(c)
     if out:
         EVIDENCE.add("triage_kb", f"kb hints: {', '.join(out[:3])}")
     return out[:5]
 
+# Fixed rendering fragments, allocated once instead of per request.
+_ADVICE_HEADER = "**Triage summary (not a diagnosis)**"
+_ADVICE_NO_MATCH = "- What it might be: We need a bit more detail to narrow this."
+_STEPS_HEADER = "- What you can do now:"
+_WARNS_HEADER = "- Watch for:"
+_SEVERE_LINE = "- Severity: **severe** → consider clinician sooner"
+
 def advice_renderer(analysis:dict)->str:
     m=analysis.get("matches",[])
     duration=analysis.get("duration",""); severity=analysis.get("severity","")
-    lines=["**Triage summary (not a diagnosis)**"]
-    lines.append(f"- What it might be: {', '.join([x['condition'] for x in m]) if m else 'We need a bit more detail to narrow this.'}")
+    # Assemble fixed-position blocks and join once, filtering the empties —
+    # no incremental list appends across the conditional branches.
+    steps_block=warns_block=""
     if m:
+        what=f"- What it might be: {', '.join([x['condition'] for x in m])}"
         steps=[]; warns=[]
         for mm in m:
             steps.extend([s for s in mm["self_care"] if s not in steps])
             warns.extend([w for w in mm["watchouts"] if w not in warns])
         if steps:
-            lines.append("- What you can do now:")
-            for s in steps[:6]: lines.append(f"  • {s}")
+            steps_block=_STEPS_HEADER+"\n"+"\n".join(f"  • {s}" for s in steps[:6])
         if warns:
-            lines.append("- Watch for:")
-            for w in warns[:6]: lines.append(f"  • {w}")
-    if duration:
-        lines.append(f"- Duration noted: **{duration}** (seek care if it persists/worsens)")
-    if severity == "severe":
-        lines.append(f"- Severity: **severe** → consider clinician sooner")
-
-    return "\n".join(lines)
+            warns_block=_WARNS_HEADER+"\n"+"\n".join(f"  • {w}" for w in warns[:6])
+    else:
+        what=_ADVICE_NO_MATCH
+    blocks=(
+        _ADVICE_HEADER,
+        what,
+        steps_block,
+        warns_block,
+        f"- Duration noted: **{duration}** (seek care if it persists/worsens)" if duration else "",
+        _SEVERE_LINE if severity == "severe" else "",
+    )
+    return "\n".join(b for b in blocks if b)
 
-def triage_pipeline(user_text: str, age_group: Optional[str]=None) -> str:
-    em = red_flag_checker(user_text)
+@functools.lru_cache(maxsize=4096)
+def _triage_cached(norm_text: str, age_group: Optional[str]) -> str:
+    """Run the full pipeline for normalized text. Deterministic, so memoized."""
+    em = red_flag_checker(norm_text)
     if em:
         return em
-    info = symptom_extract(user_text)
+    info = symptom_extract(norm_text)
     analysis = rules_lookup(info.get("symptoms", []), info.get("duration",""), info.get("severity",""), age_group=age_group)
     # Optional hints from KB (non-binding)
     _kb_lookup(info.get("symptoms", []))
     return advice_renderer(analysis)
+
+def triage_pipeline(user_text: str, age_group: Optional[str]=None) -> str:
+    # Normalize before the cache lookup so retries and case/spacing variants
+    # of the same complaint hit the same entry instead of re-running the
+    # regex scans and scoring.
+    return _triage_cached(_norm(user_text), age_group)
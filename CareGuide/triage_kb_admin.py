@@ -6,6 +6,41 @@ from typing import Any, Optional
 
 _ACTIVE_PROFILE = "default"
 
+# Hot-reload hook, resolved once per module identity instead of re-running
+# import_module plus a ladder of hasattr probes on every kb_reload call.
+# Shapes: ("single", fn) | ("triplet", loader, build, set_active)
+#         | ("warmup", fn) | ("none", detail)
+_HOOK: Optional[tuple] = None
+_HOOK_MTIME: Optional[float] = None
+
+def _resolve_hook() -> tuple:
+    global _HOOK, _HOOK_MTIME
+    try:
+        rag = import_module("app.rag_dataset")
+    except Exception as e:
+        _HOOK = ("none", str(e))
+        return _HOOK
+    try:
+        mtime = os.path.getmtime(rag.__file__)
+    except Exception:
+        mtime = None
+    if _HOOK is not None and mtime == _HOOK_MTIME:
+        return _HOOK
+    _HOOK_MTIME = mtime
+    if hasattr(rag, "reload_from_gcs"):
+        _HOOK = ("single", rag.reload_from_gcs)
+    elif hasattr(rag, "build_index"):
+        loader = next(
+            (getattr(rag, n) for n in ("load_dataset_from_gcs", "load_from_gcs", "load") if hasattr(rag, n)),
+            None,
+        )
+        _HOOK = ("triplet", loader, rag.build_index, getattr(rag, "set_active_index", None))
+    elif hasattr(rag, "warmup"):
+        _HOOK = ("warmup", rag.warmup)
+    else:
+        _HOOK = ("none", None)
+    return _HOOK
+
 def kb_reload(gcs_uri: str) -> dict:
     """
     Hot-swap the triage KB source. Always sets TRIAGE_KB_GCS.
@@ -19,17 +54,16 @@ def kb_reload(gcs_uri: str) -> dict:
 
     os.environ["TRIAGE_KB_GCS"] = uri
 
-    # Best-effort: call optional hooks if they exist
+    # Best-effort: dispatch on the pre-resolved hook if one exists
     reloaded = False
     rows_count: Optional[int] = None
     detail: Optional[str] = None
 
+    hook = _resolve_hook()
     try:
-        rag = import_module("app.rag_dataset")
-
         # 1) Single-call convenience hook
-        if hasattr(rag, "reload_from_gcs"):
-            data_or_count = rag.reload_from_gcs(uri)  # type: ignore[attr-defined]
+        if hook[0] == "single":
+            data_or_count = hook[1](uri)
             # Try to derive a row count
             try:
                 rows_count = len(data_or_count)  # dataset object (list/df)
@@ -39,33 +73,44 @@ def kb_reload(gcs_uri: str) -> dict:
             reloaded = True
 
         # 2) Separate load/build/set hooks
-        elif hasattr(rag, "build_index"):
-            # Try various loader names
-            loader = None
-            for name in ("load_dataset_from_gcs", "load_from_gcs", "load"):
-                if hasattr(rag, name):
-                    loader = getattr(rag, name)
-                    break
+        elif hook[0] == "triplet":
+            _, loader, build_index, set_active_index = hook
             data = loader(uri) if loader else None  # type: ignore[misc]
             if data is not None:
                 try:
                     rows_count = len(data)
                 except Exception:
                     rows_count = None
-                idx = rag.build_index(data)  # type: ignore[attr-defined]
-                if hasattr(rag, "set_active_index"):
-                    rag.set_active_index(idx)  # type: ignore[attr-defined]
+                idx = build_index(data)
+                if set_active_index:
+                    set_active_index(idx)
                 reloaded = True
 
         # 3) Warmup hook (rebuilds from current env)
-        elif hasattr(rag, "warmup"):
-            rag.warmup()  # type: ignore[attr-defined]
+        elif hook[0] == "warmup":
+            hook[1]()
             reloaded = True
 
+        else:
+            detail = hook[1]
+
     except Exception as e:
         # Keep it non-fatal: env var is still set
         detail = str(e)
 
+    # Drop triage's process-level JSON/index caches so the next request
+    # re-reads the (possibly swapped) KB files instead of serving stale data.
+    try:
+        from . import triage
+        triage._load_conditions.cache_clear()
+        triage._load_sym_kb.cache_clear()
+        triage._sym_kb_indexed.cache_clear()
+        triage._symptom_bits.cache_clear()
+        triage._conditions_indexed.cache_clear()
+        triage._triage_cached.cache_clear()
+    except Exception:
+        pass
+
     return {
         "status": "ok",
         "gcs_uri": uri,
@@ -1,38 +1,80 @@
 from fastapi import APIRouter, UploadFile, HTTPException
 from google.cloud import speech_v2, texttospeech
+from functools import lru_cache
+import asyncio
 import base64
+import threading
 
 router = APIRouter(prefix="/voice", tags=["voice"])
 
-def _stt_bytes_to_text(raw: bytes, lang="en-US"):
-    client = speech_v2.SpeechClient()
+# Clients are created once and reused: each SpeechClient/TextToSpeechClient
+# construction sets up a fresh gRPC channel (TLS handshake, auth metadata),
+# which dominated per-request latency. Lazy + double-checked so importing
+# this module stays cheap and credential errors surface on first use.
+_STT_CLIENT = None
+_TTS_CLIENT = None
+_RECOGNIZER = None
+_CLIENT_LOCK = threading.Lock()
+
+def _get_stt():
+    global _STT_CLIENT, _RECOGNIZER
+    if _STT_CLIENT is None:
+        with _CLIENT_LOCK:
+            if _STT_CLIENT is None:
+                client = speech_v2.SpeechClient()
+                _RECOGNIZER = f"projects/{client.project}/locations/global/recognizers/_"
+                _STT_CLIENT = client
+    return _STT_CLIENT
+
+def _get_tts():
+    global _TTS_CLIENT
+    if _TTS_CLIENT is None:
+        with _CLIENT_LOCK:
+            if _TTS_CLIENT is None:
+                _TTS_CLIENT = texttospeech.TextToSpeechClient()
+    return _TTS_CLIENT
+
+@lru_cache(maxsize=8)
+def _recognition_config(lang: str):
     # assume LINEAR16 PCM 16kHz; change if you record WebM/OGG
-    config = speech_v2.RecognitionConfig(
+    return speech_v2.RecognitionConfig(
         auto_decoding_config=speech_v2.AutoDetectDecodingConfig(),
         language_codes=[lang],
         features=speech_v2.RecognitionFeatures(enable_automatic_punctuation=True),
         model="long",  # robust default
     )
+
+@lru_cache(maxsize=8)
+def _voice_selection(voice: str):
+    return texttospeech.VoiceSelectionParams(language_code="en-US", name=voice)
+
+def _stt_bytes_to_text(raw: bytes, lang="en-US"):
+    client = _get_stt()
     req = speech_v2.RecognizeRequest(
-        recognizer=f"projects/{client.project}/locations/global/recognizers/_",
-        config=config,
+        recognizer=_RECOGNIZER,
+        config=_recognition_config(lang),
         content=raw,
     )
     resp = client.recognize(request=req)
     return resp.results[0].alternatives[0].transcript if resp.results else ""
 
+_TTS_AUDIO_CFG = None  # built lazily beside the TTS client
+
 def _tts_to_mp3(text: str, voice="en-US-Neural2-C"):
-    tts = texttospeech.TextToSpeechClient()
+    global _TTS_AUDIO_CFG
+    tts = _get_tts()
+    if _TTS_AUDIO_CFG is None:
+        _TTS_AUDIO_CFG = texttospeech.AudioConfig(audio_encoding=texttospeech.AudioEncoding.MP3)
     synthesis_input = texttospeech.SynthesisInput(text=text)
-    voice_sel = texttospeech.VoiceSelectionParams(language_code="en-US", name=voice)
-    audio_cfg = texttospeech.AudioConfig(audio_encoding=texttospeech.AudioEncoding.MP3)
-    audio = tts.synthesize_speech(input=synthesis_input, voice=voice_sel, audio_config=audio_cfg)
+    audio = tts.synthesize_speech(input=synthesis_input, voice=_voice_selection(voice), audio_config=_TTS_AUDIO_CFG)
     return base64.b64encode(audio.audio_content).decode("ascii")
 
 @router.post("/turn")
 async def voice_turn(file: UploadFile):
     raw = await file.read()
-    text = _stt_bytes_to_text(raw)
+    # The Google Cloud calls are blocking RPCs; run them on worker threads
+    # so the event loop keeps serving other requests during STT and TTS.
+    text = await asyncio.to_thread(_stt_bytes_to_text, raw)
     if not text:
         raise HTTPException(400, "Couldn’t transcribe audio.")
 
@@ -43,6 +85,6 @@ async def voice_turn(file: UploadFile):
         events.append(ev)
     # Get the latest assistant text (simplified)
     reply = next((e.content for e in reversed(events) if getattr(e, "role", "") == "assistant" and getattr(e,"content",None)), "Sorry, I didn’t catch that.")
-    mp3_b64 = _tts_to_mp3(reply)
+    mp3_b64 = await asyncio.to_thread(_tts_to_mp3, reply)
 
     return {"asr_text": text, "reply_text": reply, "reply_mp3_base64": mp3_b64}
@@ -1,78 +1,399 @@
 # frontend/voice_support.py
-import os, asyncio, base64
-from typing import List, Dict, Any, Optional
+import functools
+import hashlib
+import io
+import os, asyncio, re, threading
+from typing import AsyncIterator, Iterable, List, Dict, Any, Optional
 
+import requests
 from google.cloud import speech_v2, texttospeech
+from google.cloud.speech_v2.services.speech import transports as _speech_transports
+from google.cloud.texttospeech_v1.services.text_to_speech import transports as _tts_transports
+from requests.adapters import HTTPAdapter, Retry
 
-# --- STT (Google Speech v2) ---
-def stt_transcribe_bytes(raw: bytes, language: str = "en-US") -> str:
-    """
-    Transcribes arbitrary audio bytes using Speech-to-Text v2 with auto decoding.
-    Requires ADC (gcloud auth application-default login) and project configured.
-    """
-    client = speech_v2.SpeechClient()
-    project = os.getenv("GOOGLE_CLOUD_PROJECT")
-    if not project:
-        # Speech v2 lib can infer project, but we prefer explicit
-        project = client.project
+try:  # optional fast JSON decode for large agent event payloads
+    import orjson as _orjson
+except Exception:  # pragma: no cover - depends on environment
+    _orjson = None
+
+# Lazily-initialized singleton clients: constructing a SpeechClient /
+# TextToSpeechClient reloads ADC credentials and performs a full gRPC
+# channel setup (TCP+TLS+HTTP/2), which added hundreds of ms per
+# utterance when done inside each call.
+_stt_client: Optional[speech_v2.SpeechClient] = None
+_stt_async_client: Optional[speech_v2.SpeechAsyncClient] = None
+_tts_client: Optional[texttospeech.TextToSpeechClient] = None
+_recognizer: Optional[str] = None
+_client_lock = threading.Lock()
 
-    config = speech_v2.RecognitionConfig(
+# Keepalive pings stop idle HTTP/2 connections from being torn down by
+# NAT/load-balancer timeouts between utterances, so a mid-session turn
+# never pays channel re-establishment. STT and TTS live on different
+# endpoints, so each keeps its own channel; within a service, one channel
+# multiplexes all concurrent calls.
+_GRPC_CHANNEL_OPTIONS = [
+    ("grpc.keepalive_time_ms", 30000),
+    ("grpc.http2.max_pings_without_data", 0),
+]
+
+def _get_stt() -> speech_v2.SpeechClient:
+    global _stt_client, _recognizer
+    if _stt_client is None:
+        with _client_lock:
+            if _stt_client is None:
+                # create_channel layers ADC auth over the channel; a bare
+                # grpc.secure_channel with ssl creds alone would drop it.
+                transport = _speech_transports.SpeechGrpcTransport(
+                    channel=_speech_transports.SpeechGrpcTransport.create_channel(
+                        options=_GRPC_CHANNEL_OPTIONS,
+                    ),
+                )
+                client = speech_v2.SpeechClient(transport=transport)
+                # Speech v2 lib can infer project, but we prefer explicit
+                project = os.getenv("GOOGLE_CLOUD_PROJECT") or client.project
+                _recognizer = f"projects/{project}/locations/global/recognizers/_"
+                _stt_client = client
+    return _stt_client
+
+def _get_stt_async() -> speech_v2.SpeechAsyncClient:
+    global _stt_async_client, _recognizer
+    if _stt_async_client is None:
+        with _client_lock:
+            if _stt_async_client is None:
+                transport = _speech_transports.SpeechGrpcAsyncIOTransport(
+                    channel=_speech_transports.SpeechGrpcAsyncIOTransport.create_channel(
+                        options=_GRPC_CHANNEL_OPTIONS,
+                    ),
+                )
+                client = speech_v2.SpeechAsyncClient(transport=transport)
+                if _recognizer is None:
+                    project = os.getenv("GOOGLE_CLOUD_PROJECT") or client.project
+                    _recognizer = f"projects/{project}/locations/global/recognizers/_"
+                _stt_async_client = client
+    return _stt_async_client
+
+def _get_tts() -> texttospeech.TextToSpeechClient:
+    global _tts_client
+    if _tts_client is None:
+        with _client_lock:
+            if _tts_client is None:
+                transport = _tts_transports.TextToSpeechGrpcTransport(
+                    channel=_tts_transports.TextToSpeechGrpcTransport.create_channel(
+                        options=_GRPC_CHANNEL_OPTIONS,
+                    ),
+                )
+                _tts_client = texttospeech.TextToSpeechClient(transport=transport)
+    return _tts_client
+
+# Request protos are immutable once built, so cache them per parameter value
+# instead of re-running proto construction (field validation, message
+# allocation) on every utterance. Cardinality is tiny — a handful of
+# languages/voices/encodings per deployment — so maxsize=8 is plenty.
+@functools.lru_cache(maxsize=8)
+def _auto_config(language: str) -> speech_v2.RecognitionConfig:
+    return speech_v2.RecognitionConfig(
         auto_decoding_config=speech_v2.AutoDetectDecodingConfig(),
         language_codes=[language],
         features=speech_v2.RecognitionFeatures(enable_automatic_punctuation=True),
         model="long",
     )
+
+@functools.lru_cache(maxsize=8)
+def _pcm_config(language: str) -> speech_v2.RecognitionConfig:
+    return speech_v2.RecognitionConfig(
+        explicit_decoding_config=speech_v2.ExplicitDecodingConfig(
+            encoding=speech_v2.ExplicitDecodingConfig.AudioEncoding.LINEAR16,
+            sample_rate_hertz=16000,
+            audio_channel_count=1,
+        ),
+        language_codes=[language],
+        features=speech_v2.RecognitionFeatures(enable_automatic_punctuation=True),
+        model="long",
+    )
+
+@functools.lru_cache(maxsize=8)
+def _streaming_config(language: str) -> speech_v2.StreamingRecognitionConfig:
+    return speech_v2.StreamingRecognitionConfig(config=_auto_config(language))
+
+@functools.lru_cache(maxsize=8)
+def _voice_params(voice_name: str) -> texttospeech.VoiceSelectionParams:
+    return texttospeech.VoiceSelectionParams(language_code="en-US", name=voice_name)
+
+@functools.lru_cache(maxsize=8)
+def _audio_config(encoding) -> texttospeech.AudioConfig:
+    return texttospeech.AudioConfig(audio_encoding=encoding)
+
+# --- STT (Google Speech v2) ---
+def stt_transcribe_bytes(raw: bytes, language: str = "en-US") -> str:
+    """
+    Transcribes arbitrary audio bytes using Speech-to-Text v2 with auto decoding.
+    Requires ADC (gcloud auth application-default login) and project configured.
+    """
+    client = _get_stt()
     req = speech_v2.RecognizeRequest(
-        recognizer=f"projects/{project}/locations/global/recognizers/_",
-        config=config,
+        recognizer=_recognizer,
+        config=_auto_config(language),
         content=raw,
     )
     resp = client.recognize(request=req)
-    if not resp.results:
-        return ""
-    return resp.results[0].alternatives[0].transcript.strip()
+    # The "long" model can return multiple result segments; keeping only
+    # results[0] silently dropped everything after the first and forced
+    # callers into a second recognize round-trip. Join all segments (list
+    # comprehension so str.join sees a sized sequence).
+    return " ".join([r.alternatives[0].transcript for r in resp.results if r.alternatives]).strip()
+
+async def stt_transcribe_bytes_async(raw: bytes, language: str = "en-US") -> str:
+    """
+    Async variant of `stt_transcribe_bytes` using SpeechAsyncClient.
+
+    Lets callers gather the transcript concurrently with other warm-up work
+    (agent context preflight, tool prefetch) instead of serializing the
+    whole voice turn behind the STT round-trip.
+    """
+    client = _get_stt_async()
+    req = speech_v2.RecognizeRequest(recognizer=_recognizer, config=_auto_config(language), content=raw)
+    resp = await client.recognize(request=req)
+    return " ".join([r.alternatives[0].transcript for r in resp.results if r.alternatives]).strip()
+
+def stt_transcribe_stream(audio_chunks: Iterable[bytes], language: str = "en-US") -> str:
+    """
+    Transcribes audio as it arrives using Speech v2 streaming recognition.
+
+    Pass raw frames straight from the mic (e.g. 100ms chunks); recognition
+    runs while audio is still being captured, so the transcript is ready
+    almost immediately after the utterance ends instead of only after a
+    full-buffer upload. Returns the concatenated final transcript.
+    """
+    client = _get_stt()
+    streaming_config = _streaming_config(language)
+
+    def _requests():
+        # First message carries the config; the rest carry audio.
+        yield speech_v2.StreamingRecognizeRequest(recognizer=_recognizer, streaming_config=streaming_config)
+        for chunk in audio_chunks:
+            if chunk:
+                yield speech_v2.StreamingRecognizeRequest(audio=chunk)
+
+    finals: List[str] = []
+    for resp in client.streaming_recognize(requests=_requests()):
+        for result in resp.results:
+            # One proto attribute fetch per result on the streaming hot path.
+            alts = result.alternatives
+            if result.is_final and alts:
+                finals.append(alts[0].transcript.strip())
+    return " ".join(t for t in finals if t)
+
+def prewarm_voice_clients(timeout: float = 5.0) -> None:
+    """
+    Builds both clients and waits for their gRPC channels to become ready.
+
+    Call once at app startup (before the mic is armed) so the first real
+    utterance doesn't pay the TLS/HTTP2 handshake that otherwise lands on
+    the first user-facing request. Best-effort: failures are left for the
+    first real call to surface.
+    """
+    for client in (_get_stt(), _get_tts()):
+        try:
+            import grpc
+            grpc.channel_ready_future(client.transport.grpc_channel).result(timeout=timeout)
+        except Exception:
+            pass
+
+def _ensure_16k_mono(raw: bytes, sample_rate_hertz: int, channels: int = 1) -> bytes:
+    """
+    Downmixes/resamples 16-bit PCM to 16kHz mono before upload.
+
+    Browsers typically capture at 48kHz stereo — ~6x the bytes STT needs —
+    so converting in-process cuts upload size and decode latency
+    proportionally. No-op when the input is already 16kHz mono.
+    """
+    if sample_rate_hertz == 16000 and channels == 1:
+        return raw
+    import audioop  # stdlib for the <3.13 range this project pins
+    if channels == 2:
+        raw = audioop.tomono(raw, 2, 0.5, 0.5)
+    if sample_rate_hertz != 16000:
+        raw, _ = audioop.ratecv(raw, 2, 1, sample_rate_hertz, 16000, None)
+    return raw
+
+def stt_transcribe_pcm_bytes(raw: bytes, language: str = "en-US", sample_rate_hertz: int = 16000, channels: int = 1) -> str:
+    """
+    Transcribes raw 16-bit PCM with an explicit decoding config.
+
+    When the caller already knows the format (e.g. mic capture), this
+    skips the auto-detect decode path, which is both slower and less
+    accurate than telling the API exactly what the bytes are. Input at
+    other rates/channel counts is converted to 16kHz mono locally so the
+    upload stays small.
+    """
+    client = _get_stt()
+    raw = _ensure_16k_mono(raw, sample_rate_hertz, channels)
+    req = speech_v2.RecognizeRequest(recognizer=_recognizer, config=_pcm_config(language), content=raw)
+    resp = client.recognize(request=req)
+    return " ".join([r.alternatives[0].transcript for r in resp.results if r.alternatives]).strip()
 
 # --- TTS (Google Text-to-Speech) ---
+def _synthesize(text: str, voice_name: str, encoding) -> bytes:
+    tts = _get_tts()
+    synthesis_input = texttospeech.SynthesisInput(text=text)
+    audio = tts.synthesize_speech(
+        input=synthesis_input,
+        voice=_voice_params(voice_name),
+        audio_config=_audio_config(encoding),
+    )
+    return audio.audio_content
+
+# Voice UIs re-speak the same prompts and confirmations constantly; cache
+# synthesized audio so repeat phrases skip the TTS round-trip. Keyed on
+# (text, voice, encoding) so format variants never collide.
+@functools.lru_cache(maxsize=256)
+def _tts_cached(text: str, voice_name: str, encoding) -> bytes:
+    return _synthesize(text, voice_name, encoding)
+
 def tts_mp3_bytes(text: str, voice_name: str = "en-US-Neural2-C") -> bytes:
     """
     Synthesizes MP3 audio from text.
     """
-    tts = texttospeech.TextToSpeechClient()
-    synthesis_input = texttospeech.SynthesisInput(text=text)
-    voice = texttospeech.VoiceSelectionParams(language_code="en-US", name=voice_name)
-    audio_cfg = texttospeech.AudioConfig(audio_encoding=texttospeech.AudioEncoding.MP3)
-    audio = tts.synthesize_speech(input=synthesis_input, voice=voice, audio_config=audio_cfg)
-    return audio.audio_content
+    return _tts_cached(text, voice_name, texttospeech.AudioEncoding.MP3)
+
+def tts_ogg_bytes(text: str, voice_name: str = "en-US-Neural2-C") -> bytes:
+    """
+    Synthesizes OGG_OPUS audio — noticeably smaller payloads than MP3 at
+    comparable quality, for faster delivery to web players that support it.
+    """
+    return _tts_cached(text, voice_name, texttospeech.AudioEncoding.OGG_OPUS)
+
+def tts_pcm_bytes(text: str, voice_name: str = "en-US-Neural2-C") -> bytes:
+    """
+    Synthesizes LINEAR16 PCM for direct playback (sounddevice/pyaudio),
+    skipping the client-side MP3 decode stage entirely.
+    """
+    return _tts_cached(text, voice_name, texttospeech.AudioEncoding.LINEAR16)
+
+def tts_audio_buffer(text: str, voice_name: str = "en-US-Neural2-C") -> io.BytesIO:
+    """
+    MP3 audio wrapped in a BytesIO for in-process consumers (e.g.
+    st.audio). Hands the widget the raw bytes directly — no base64
+    round-trip and its ~33% payload inflation.
+    """
+    return io.BytesIO(tts_mp3_bytes(text, voice_name))
+
+async def tts_mp3_bytes_parallel(text: str, voice_name: str = "en-US-Neural2-C", max_concurrency: int = 8) -> bytes:
+    """
+    Synthesizes a long reply sentence-by-sentence in parallel and joins the
+    MP3 frames. Wall-clock drops from the sum of all sentences to roughly
+    the slowest chunk; concurrency is capped to stay inside TTS quota.
+    """
+    sentences = [s for s in _SENTENCE_SPLIT.split(text) if s.strip()]
+    if len(sentences) <= 1:
+        return await asyncio.to_thread(tts_mp3_bytes, text, voice_name)
+    sem = asyncio.Semaphore(max_concurrency)
+
+    async def _one(sentence: str) -> bytes:
+        async with sem:
+            return await asyncio.to_thread(tts_mp3_bytes, sentence, voice_name)
+
+    # MP3 frames are self-contained, so the per-sentence outputs concatenate
+    # into a single playable stream.
+    chunks = await asyncio.gather(*[_one(s) for s in sentences])
+    return b"".join(chunks)
 
 # --- Agent invocation (HTTP or in-process) ---
+# Pooled keep-alive session so repeated agent invocations reuse the same
+# TCP connection instead of re-handshaking per call.
+_http_session = None
+
+def _get_http_session():
+    global _http_session
+    if _http_session is None:
+        with _client_lock:
+            if _http_session is None:
+                s = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=10,
+                    pool_maxsize=20,
+                    max_retries=Retry(total=2, backoff_factor=0.1),
+                )
+                s.mount("http://", adapter)
+                s.mount("https://", adapter)
+                _http_session = s
+    return _http_session
+
+def close_session() -> None:
+    """Release pooled connections (call at shutdown)."""
+    global _http_session
+    if _http_session is not None:
+        _http_session.close()
+        _http_session = None
+
 def invoke_agent_http(messages: List[Dict[str, Any]], base_url: str = "http://127.0.0.1:8000", app_name: str = "app") -> str:
     """
     Calls ADK API server. Start it with:
       uv run adk api_server app --port 8000
     Returns the assistant's final text.
     """
-    import requests
-    r = requests.post(f"{base_url}/api/invoke", params={"app_name": app_name}, json={"messages": messages}, timeout=120)
+    r = _get_http_session().post(f"{base_url}/api/invoke", params={"app_name": app_name}, json={"messages": messages}, timeout=120)
     r.raise_for_status()
-    data = r.json()
+    # orjson parses straight from the raw bytes (no .text decode pass) and is
+    # several times faster than stdlib json on multi-KB event payloads.
+    data = _orjson.loads(r.content) if _orjson is not None else r.json()
     # ADK responses differ by version; extract the last assistant content robustly:
     txt = ""
     if isinstance(data, dict):
-        # common shape: {"messages":[...]}
+        # common shape: {"messages":[...]}; next() over the reversed view
+        # stops at the first hit instead of looping with flag checks.
         msgs = data.get("messages") or []
-        for m in reversed(msgs):
-            if m.get("role") == "assistant" and m.get("content"):
-                txt = m["content"]
-                break
+        txt = next((m["content"] for m in reversed(msgs)
+                    if m.get("role") == "assistant" and m.get("content")), "")
         # fallback: event stream
-        if not txt and "events" in data:
-            for ev in reversed(data["events"]):
-                if ev.get("role") == "assistant" and ev.get("content"):
-                    txt = ev["content"]
-                    break
+        if not txt:
+            txt = next((ev["content"] for ev in reversed(data.get("events") or [])
+                        if ev.get("role") == "assistant" and ev.get("content")), "")
     return txt or "Sorry, I couldn’t generate a response."
 
+async def invoke_agent_http_async(messages: List[Dict[str, Any]], base_url: str = "http://127.0.0.1:8000", app_name: str = "app") -> str:
+    """
+    Async variant for concurrent voice sessions: runs the pooled-session
+    call on a worker thread so the event loop is never blocked, and
+    overlapping invocations share the session's keep-alive connections.
+    """
+    return await asyncio.to_thread(invoke_agent_http, messages, base_url, app_name)
+
+# Short-lived reply cache for the in-process path: voice users repeat the
+# same commands and greetings, and each repeat was a full LLM round-trip.
+# Keyed on the last user message plus a digest of the recent history so a
+# repeated question in a *different* conversation context never collides.
+# Reuses the TTLCache from app.assistant_tools (bounded, unlike lru_cache);
+# built lazily since app imports are deferred throughout this module.
+_reply_cache = None
+
+def _get_reply_cache():
+    global _reply_cache
+    if _reply_cache is None:
+        with _client_lock:
+            if _reply_cache is None:
+                from app.assistant_tools import TTLCache
+                _reply_cache = TTLCache(ttl_sec=300, max_items=128)
+    return _reply_cache
+
+def _reply_cache_key(messages: List[Dict[str, Any]]) -> tuple:
+    last = next((m.get("content", "") for m in reversed(messages) if m.get("role") == "user"), "")
+    # blake2b: fastest stdlib digest for short inputs; 16 bytes is plenty
+    # to make context collisions negligible.
+    h = hashlib.blake2b(digest_size=16)
+    for m in messages[-6:]:
+        h.update(str(m.get("role", "")).encode())
+        h.update(b"\x00")
+        h.update(str(m.get("content", "")).encode())
+        h.update(b"\x00")
+    return (last, h.digest())
+
 async def _invoke_agent_inproc_async(messages: List[Dict[str, Any]]) -> str:
+    cache = _get_reply_cache()
+    key = _reply_cache_key(messages)
+    hit = cache.get(key)
+    if hit is not None:
+        return hit
     # In-process: import your ADK agent directly
     from app.agent import root_agent
     final = ""
@@ -81,7 +402,79 @@ async def _invoke_agent_inproc_async(messages: List[Dict[str, Any]]) -> str:
         role = getattr(ev, "role", None)
         if role == "assistant" and content:
             final = content
+    if final:  # only cache real replies, never the fallback apology
+        cache.set(key, final)
     return final or "Sorry, I couldn’t generate a response."
 
+# Dedicated background event loop: asyncio.run per call would build and tear
+# down a fresh loop (and any async resources the agent holds, like gRPC
+# pools) on every invocation. One daemon-thread loop serves all calls.
+_agent_loop: Optional[asyncio.AbstractEventLoop] = None
+
+def _get_agent_loop() -> asyncio.AbstractEventLoop:
+    global _agent_loop
+    if _agent_loop is None:
+        with _client_lock:
+            if _agent_loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="agent-loop", daemon=True).start()
+                _agent_loop = loop
+    return _agent_loop
+
 def invoke_agent_inproc(messages: List[Dict[str, Any]]) -> str:
-    return asyncio.run(_invoke_agent_inproc_async(messages))
+    fut = asyncio.run_coroutine_threadsafe(_invoke_agent_inproc_async(messages), _get_agent_loop())
+    return fut.result(timeout=120)
+
+# --- Streaming pipeline: agent text -> per-sentence TTS ---
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+")
+
+async def stream_agent_inproc(messages: List[Dict[str, Any]]) -> AsyncIterator[str]:
+    """
+    Yields assistant text chunks from the in-process agent as they arrive,
+    instead of waiting for the final message.
+    """
+    from app.agent import root_agent
+    async for ev in root_agent.run_async({"messages": messages}):
+        content = getattr(ev, "content", None)
+        role = getattr(ev, "role", None)
+        if role == "assistant" and content:
+            yield content
+
+async def tts_stream_sentences(text_iter: AsyncIterator[str], voice_name: str = "en-US-Neural2-C") -> AsyncIterator[bytes]:
+    """
+    Pipelines text into TTS at sentence boundaries: a background task keeps
+    consuming `text_iter` and schedules synthesis for each completed
+    sentence, so audio for sentence N is ready while N+1 is still being
+    generated. Yields MP3 chunks in sentence order; push each one to the
+    audio player as it arrives.
+    """
+    done = object()
+    q: asyncio.Queue = asyncio.Queue()
+
+    async def _pump() -> None:
+        buf = ""
+        try:
+            async for delta in text_iter:
+                buf += delta
+                parts = _SENTENCE_SPLIT.split(buf)
+                for sentence in parts[:-1]:
+                    if sentence.strip():
+                        await q.put(asyncio.ensure_future(
+                            asyncio.to_thread(tts_mp3_bytes, sentence, voice_name)))
+                buf = parts[-1]
+            if buf.strip():
+                await q.put(asyncio.ensure_future(
+                    asyncio.to_thread(tts_mp3_bytes, buf, voice_name)))
+        finally:
+            await q.put(done)
+
+    pump = asyncio.ensure_future(_pump())
+    try:
+        while True:
+            item = await q.get()
+            if item is done:
+                break
+            yield await item
+        await pump  # surface any producer-side exception
+    finally:
+        pump.cancel()